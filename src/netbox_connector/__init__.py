@@ -1,3 +1,14 @@
 """NetBox Connector package."""
 
-from .connector_cli import main as cli_main  # noqa: F401
+__all__ = ["cli_main"]
+
+
+def __getattr__(name):
+    # Resolved on first use so importing a submodule (e.g. the NetBox script
+    # form) does not pull in the CLI and everything it imports.
+    if name == "cli_main":
+        from .connector_cli import main as cli_main
+
+        globals()["cli_main"] = cli_main
+        return cli_main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import copy
+import functools
 import os
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import yaml
+
+_RE_SLUG_SEPARATORS = re.compile(r"[^a-z0-9]+")
 
 
 PACKAGE_ROOT = Path(__file__).parent
@@ -27,6 +31,7 @@ __all__ = [
     "load_yaml",
     "resolve_settings_path",
     "load_app_config",
+    "clear_config_cache",
 ]
 
 
@@ -39,7 +44,12 @@ class NetBoxConfig:
     proposals_dir: Path = Path("proposals")
 
 
+_TRANSFORMS = {"lower": str.lower, "upper": str.upper}
+
+
 class RegexRule:
+    __slots__ = ("pattern", "value", "template", "transform", "_named_groups", "_transform")
+
     def __init__(
         self,
         pattern: str,
@@ -51,6 +61,9 @@ class RegexRule:
         self.value = value
         self.template = template
         self.transform = transform
+        # Resolved once here instead of re-deciding on every apply() call.
+        self._named_groups = bool(self.pattern.groupindex)
+        self._transform = _TRANSFORMS.get(transform) if transform else None
 
     def apply(self, candidate: str) -> Optional[str]:
         match = self.pattern.search(candidate)
@@ -58,27 +71,32 @@ class RegexRule:
             return None
         if self.value is not None:
             result = self.value
-        elif self.template is not None:
-            groups = match.groupdict()
-            if groups:
-                result = self.template.format(**groups)
-            else:
-                result = self.template.format(*match.groups())
-        else:
-            result = None
-
-        if result is None:
+        elif self.template is None:
             return None
+        elif self._named_groups:
+            result = self.template.format(**match.groupdict())
+        else:
+            result = self.template.format(*match.groups())
 
-        if self.transform == "lower":
-            result = result.lower()
-        elif self.transform == "upper":
-            result = result.upper()
-
+        if self._transform is not None:
+            result = self._transform(result)
         return result
 
 
 class RulesEngine:
+    __slots__ = (
+        "role_rules",
+        "site_rules",
+        "manufacturer_rules",
+        "device_type_rules",
+        "interface_rules",
+        "device_type_suffix",
+        "defaults",
+        "_interface_matchers",
+        "_interface_type_cache",
+        "_slug_cache",
+    )
+
     def __init__(
         self,
         role_rules: Iterable[RegexRule],
@@ -89,13 +107,20 @@ class RulesEngine:
         device_type_suffix: Dict[str, str],
         defaults: Dict[str, Optional[str]],
     ) -> None:
-        self.role_rules = list(role_rules)
-        self.site_rules = list(site_rules)
-        self.manufacturer_rules = list(manufacturer_rules)
-        self.device_type_rules = list(device_type_rules)
+        self.role_rules = tuple(role_rules)
+        self.site_rules = tuple(site_rules)
+        self.manufacturer_rules = tuple(manufacturer_rules)
+        self.device_type_rules = tuple(device_type_rules)
         self.interface_rules = interface_rules
         self.device_type_suffix = device_type_suffix
         self.defaults = defaults
+        self._interface_matchers = [
+            (re.compile(matcher["pattern"]), matcher["type"])
+            for matcher in interface_rules.get("matches", [])
+            if matcher.get("pattern") and matcher.get("type")
+        ]
+        self._interface_type_cache: Dict[Tuple[str, bool], str] = {}
+        self._slug_cache: Dict[Tuple[str, str], str] = {}
 
     def role_slug(self, host_name: str) -> str:
         return self._apply_rules(host_name, self.role_rules, "role_slug")
@@ -107,6 +132,13 @@ class RulesEngine:
         return self._apply_rules(hostname, self.manufacturer_rules, "manufacturer_slug")
 
     def device_type_slug(self, device_type: str) -> str:
+        key = ("device_type_slug", device_type)
+        cached = self._slug_cache.get(key)
+        if cached is None:
+            cached = self._slug_cache[key] = self._match_device_type(device_type)
+        return cached
+
+    def _match_device_type(self, device_type: str) -> str:
         for rule in self.device_type_rules:
             value = rule.apply(device_type)
             if value:
@@ -123,17 +155,32 @@ class RulesEngine:
         return self.device_type_suffix.get("value", "")
 
     def interface_type(self, interface_name: str, is_lag: bool = False) -> str:
+        key = (interface_name, is_lag)
+        cached = self._interface_type_cache.get(key)
+        if cached is None:
+            cached = self._interface_type_cache[key] = self._match_interface_type(
+                interface_name, is_lag
+            )
+        return cached
+
+    def _match_interface_type(self, interface_name: str, is_lag: bool) -> str:
         if is_lag:
             return self.interface_rules.get("lag_default", "lag")
-        matches = self.interface_rules.get("matches", [])
-        for matcher in matches:
-            pattern = matcher.get("pattern")
-            iface_type = matcher.get("type")
-            if pattern and iface_type and re.search(pattern, interface_name):
+        for pattern, iface_type in self._interface_matchers:
+            if pattern.search(interface_name):
                 return iface_type
         return self.interface_rules.get("physical_default", "other")
 
     def _apply_rules(self, host_name: str, rules: Iterable[RegexRule], default_key: str) -> str:
+        # Rules never change after construction, so a slug only depends on the
+        # host name; failures are not cached and keep raising.
+        key = (default_key, host_name)
+        cached = self._slug_cache.get(key)
+        if cached is None:
+            cached = self._slug_cache[key] = self._match_rules(host_name, rules, default_key)
+        return cached
+
+    def _match_rules(self, host_name: str, rules: Iterable[RegexRule], default_key: str) -> str:
         for rule in rules:
             value = rule.apply(host_name)
             if value:
@@ -145,9 +192,8 @@ class RulesEngine:
 
     @staticmethod
     def _slugify(value: str) -> str:
-        value = value.strip().lower()
-        value = re.sub(r"[^a-z0-9]+", "-", value)
-        return value.strip("-")
+        # Surrounding whitespace becomes a separator run that strip("-") drops.
+        return _RE_SLUG_SEPARATORS.sub("-", value.lower()).strip("-")
 
 
 @dataclass(slots=True)
@@ -158,20 +204,60 @@ class AppConfig:
     rules: RulesEngine
 
 
+FileSignature = Tuple[str, int, int]
+
+
+def _file_signature(path: Path) -> FileSignature:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {path}") from None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_yaml(signature: FileSignature) -> Dict:
+    # PyYAML is imported on first parse so modules that only need the config
+    # classes do not pay for it at import time.
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(signature[0], "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=loader) or {}
+
+
 def load_yaml(path: Path) -> Dict:
-    if not path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+    # Parsed documents are cached per (path, mtime, size); hand out a copy so
+    # callers can never mutate the cached tree.
+    return copy.deepcopy(_parse_yaml(_file_signature(path)))
+
+
+# Least recently used AppConfigs, bounded like _parse_yaml: every settings or
+# rules edit and every token rotation produces a new key.
+_APP_CONFIG_CACHE_SIZE = 16
+_APP_CONFIG_CACHE: "OrderedDict[Tuple, AppConfig]" = OrderedDict()
+
+
+def clear_config_cache() -> None:
+    """Forget every parsed YAML document and memoized AppConfig."""
+    _parse_yaml.cache_clear()
+    _APP_CONFIG_CACHE.clear()
 
 
 def resolve_settings_path(candidate: Optional[Path]) -> Path:
+    return _resolve_settings_signature(candidate)[0]
+
+
+def _resolve_settings_signature(candidate: Optional[Path]) -> Tuple[Path, FileSignature]:
+    # The stat that probes for the settings file also yields its cache
+    # signature, so each load stats it once.
     if candidate:
-        return candidate
-    if DEFAULT_SETTINGS_PATH.exists():
-        return DEFAULT_SETTINGS_PATH
-    if EXAMPLE_SETTINGS_PATH.exists():
-        return EXAMPLE_SETTINGS_PATH
+        return candidate, _file_signature(candidate)
+    for path in (DEFAULT_SETTINGS_PATH, EXAMPLE_SETTINGS_PATH):
+        try:
+            return path, _file_signature(path)
+        except FileNotFoundError:
+            continue
     raise FileNotFoundError(
         "No settings.yaml found. Copy settings.example.yaml and customise it for your environment."
     )
@@ -182,12 +268,48 @@ def load_app_config(
     rules_path: Optional[Path] = None,
     allow_missing_token: bool = False,
 ) -> AppConfig:
-    settings_path = resolve_settings_path(settings_path)
+    settings_path, settings_signature = _resolve_settings_signature(settings_path)
     rules_path = rules_path or DEFAULT_RULES_PATH
 
-    settings_data = load_yaml(settings_path)
-    rules_data = load_yaml(rules_path)
+    rules_signature = _file_signature(rules_path)
+    settings_data = _parse_yaml(settings_signature)
+    token_env = settings_data.get("netbox", {}).get("token_env") or "NETBOX_TOKEN"
 
+    cache_key = (
+        settings_signature,
+        rules_signature,
+        os.environ.get(token_env),
+        allow_missing_token,
+    )
+    cached = _APP_CONFIG_CACHE.get(cache_key)
+    if cached is None:
+        cached = _build_app_config(
+            settings_path,
+            rules_path,
+            copy.deepcopy(settings_data),
+            copy.deepcopy(_parse_yaml(rules_signature)),
+            allow_missing_token,
+        )
+        _APP_CONFIG_CACHE[cache_key] = cached
+        while len(_APP_CONFIG_CACHE) > _APP_CONFIG_CACHE_SIZE:
+            _APP_CONFIG_CACHE.popitem(last=False)
+    else:
+        _APP_CONFIG_CACHE.move_to_end(cache_key)
+
+    # The rules engine is shared on purpose: its rules never change after
+    # construction, and the lookup memos it fills are keyed on inputs only, so
+    # every caller benefits from them. The NetBox section is copied because
+    # callers adjust it (e.g. proposals_dir).
+    return replace(cached, netbox=replace(cached.netbox))
+
+
+def _build_app_config(
+    settings_path: Path,
+    rules_path: Path,
+    settings_data: Dict,
+    rules_data: Dict,
+    allow_missing_token: bool,
+) -> AppConfig:
     netbox_section = settings_data.get("netbox", {})
 
     token_env = netbox_section.get("token_env") or "NETBOX_TOKEN"
@@ -202,15 +324,13 @@ def load_app_config(
                 "NetBox API token must be provided via environment variable or settings file"
             )
 
-    proposals_dir = Path(netbox_section.get("proposals_dir", "proposals"))
-    proposals_dir.mkdir(parents=True, exist_ok=True)
-
     netbox_config = NetBoxConfig(
         url=netbox_section.get("url", "https://netbox.example.com"),
         token=token,
         verify_ssl=netbox_section.get("verify_ssl", True),
         device_name_suffix=netbox_section.get("device_name_suffix", ""),
-        proposals_dir=proposals_dir,
+        # Created on demand by the proposal writer, not at load time.
+        proposals_dir=Path(netbox_section.get("proposals_dir", "proposals")),
     )
 
     defaults = {
@@ -256,12 +376,14 @@ def load_app_config(
     )
 
 
-def _build_regex_rules(data: Iterable[Dict]) -> Iterable[RegexRule]:
-    for entry in data:
-        pattern = entry.get("pattern")
-        value = entry.get("slug") or entry.get("value")
-        template = entry.get("slug_format")
-        transform = entry.get("transform")
-        if not pattern:
-            continue
-        yield RegexRule(pattern=pattern, value=value, template=template, transform=transform)
+def _build_regex_rules(data: Iterable[Dict]) -> List[RegexRule]:
+    return [
+        RegexRule(
+            pattern=entry["pattern"],
+            value=entry.get("slug") or entry.get("value"),
+            template=entry.get("slug_format"),
+            transform=entry.get("transform"),
+        )
+        for entry in data
+        if entry.get("pattern")
+    ]
@@ -1,36 +1,31 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import functools
 import getpass
 import logging
 import sys
 from pathlib import Path
-from types import SimpleNamespace
-from typing import Iterable, List, Optional
-
-from .config_loader import AppConfig, load_app_config
-from .models import (
-    NormalizedDevice,
-    NormalizedInterface,
-    NormalizedInventory,
-    NormalizedLag,
-    NormalizedModule,
-    NormalizedModuleBay,
-)
+from typing import Iterable, List, Optional, Tuple
+
+from .config_loader import load_app_config
 from .netbox_devices_full import NetboxDeviceBuilder
-from .netmiko_ssh_handler import NetmikoDataCollector
+from .models import NormalizedInventory, ProposalBatch
+from .netmiko_ssh_handler import NetmikoDataCollector, harvest_many
 
 
 log = logging.getLogger(__name__)
 
-__all__ = ["main", "parse_args", "device_os_choices"]
+__all__ = ["main", "parse_args", "device_os_choices", "load_device_targets"]
 
 
-def device_os_choices() -> Iterable[str]:
+@functools.lru_cache(maxsize=1)
+def device_os_choices() -> Tuple[str, ...]:
     choices = set()
     for aliases in NetmikoDataCollector.device_type_alias.values():
         choices.update(aliases)
-    return sorted(choices)
+    return tuple(sorted(choices))
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -70,12 +65,28 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Allow updates to existing NetBox objects during apply",
     )
+    parser.add_argument(
+        "--skip-verify",
+        action="store_true",
+        help="Skip re-reading the device from NetBox after apply to report remaining differences",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         help="Logging verbosity",
     )
+    parser.add_argument(
+        "--devices-file",
+        type=Path,
+        help="CSV with ip,device_os,username columns; harvests every listed device instead of a single one",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=4,
+        help="Maximum number of devices harvested concurrently with --devices-file",
+    )
     parser.add_argument(
         "--simulate",
         action="store_true",
@@ -88,7 +99,7 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
 
-    if not args.simulate:
+    if not args.simulate and not args.devices_file:
         missing = [
             name
             for name, value in {
@@ -102,6 +113,17 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             log.error("Missing required arguments: %s", ", ".join(missing))
             return 1
 
+    targets: List[Tuple[str, str, str]] = []
+    if not args.simulate:
+        if args.devices_file:
+            try:
+                targets = load_device_targets(args.devices_file)
+            except (OSError, ValueError) as exc:
+                log.error("Failed to read devices file: %s", exc)
+                return 1
+        else:
+            targets = [(args.ip, args.device_os, args.username)]
+
     password = None
     if not args.simulate:
         password = args.password or getpass.getpass(prompt="SSH password: ")
@@ -116,44 +138,77 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         log.error("Failed to load configuration: %s", exc)
         return 1
 
+    exit_code = 0
+    inventories: List[NormalizedInventory] = []
     if args.simulate:
-        inventory = _build_sample_inventory(config)
+        from .simulate import _build_fake_netbox_api, _build_sample_inventory
+
+        inventories.append(_build_sample_inventory(config))
         builder = NetboxDeviceBuilder(config=config, nb_api=_build_fake_netbox_api())
     else:
-        ssh_config = NetmikoDataCollector.build_ssh_config(
-            args.ip,
-            args.username,
-            password,
-            args.device_os,
-        )
-
-        collector = NetmikoDataCollector(ssh_config, rules=config.rules)
-
-        try:
-            log.info("Connecting to %s...", args.ip)
-            collector.connect_or_fail()
-            inventory = collector.harvest()
+        ssh_configs = [
+            NetmikoDataCollector.build_ssh_config(ip, username, password, device_os)
+            for ip, device_os, username in targets
+        ]
+        log.info("Connecting to %s...", ", ".join(ip for ip, _, _ in targets))
+        results = harvest_many(ssh_configs, config.rules, max_workers=args.max_workers)
+        for ssh_config, inventory, error in results:
+            if error is not None:
+                log.error("Data collection failed for %s: %s", ssh_config["ip"], error)
+                exit_code = 1
+                continue
             log.info("Harvest complete for %s", inventory.device.name)
-        except Exception as exc:  # pylint: disable=broad-except
-            log.error("Data collection failed: %s", exc)
-            return 1
-        finally:
-            try:
-                collector.disconnect()
-            except Exception:  # pylint: disable=broad-except
-                pass
+            inventories.append(inventory)
 
+        if not inventories:
+            return exit_code
         builder = NetboxDeviceBuilder(config=config)
 
     try:
-        batch, proposal_path, summary = builder.dry_run(inventory)
+        if len(inventories) > 1:
+            # Fleet runs share one JSON Lines proposals file.
+            planned, proposal_path = builder.dry_run_many(inventories)
+            dry_runs = [(batch, proposal_path, summary) for batch, summary in planned]
+        else:
+            dry_runs = [builder.dry_run(inventories[0])]
     except Exception as exc:  # pylint: disable=broad-except
         log.error("Dry-run failed: %s", exc)
         return 1
 
+    for inventory, dry_run in zip(inventories, dry_runs):
+        exit_code = max(exit_code, _sync_inventory(builder, inventory, dry_run, args))
+    return exit_code
+
+
+def load_device_targets(path: Path) -> List[Tuple[str, str, str]]:
+    """Read ``(ip, device_os, username)`` rows from a CSV file with a header line."""
+    valid_os = set(device_os_choices())
+    targets: List[Tuple[str, str, str]] = []
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        for line_number, row in enumerate(csv.DictReader(handle), start=2):
+            ip = (row.get("ip") or "").strip()
+            device_os = (row.get("device_os") or "").strip()
+            username = (row.get("username") or "").strip()
+            if not (ip and device_os and username):
+                raise ValueError(f"{path}:{line_number}: ip, device_os and username are required")
+            if device_os not in valid_os:
+                raise ValueError(f"{path}:{line_number}: unsupported device_os '{device_os}'")
+            targets.append((ip, device_os, username))
+    if not targets:
+        raise ValueError(f"{path}: no devices listed")
+    return targets
+
+
+def _sync_inventory(
+    builder: NetboxDeviceBuilder,
+    inventory: NormalizedInventory,
+    dry_run: Tuple[ProposalBatch, Optional[Path], str],
+    args: argparse.Namespace,
+) -> int:
+    batch, proposal_path, summary = dry_run
+
     print("\n=== Dry-run summary ===")
-    for line in summary.splitlines():
-        print(line)
+    print(summary)
     if proposal_path:
         print(f"Proposals saved to: {proposal_path}")
 
@@ -165,8 +220,7 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         print("\nDry-run only. Re-run with --apply to push changes.")
         return 0
 
-    updates_present = any(action.action == "update" for action in batch.actions())
-    if updates_present and not args.update_existing:
+    if batch.has_updates() and not args.update_existing:
         print(
             "Updates detected but --update-existing not set. Aborting before applying changes.",
             file=sys.stderr,
@@ -174,129 +228,21 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         return 1
 
     try:
-        before_batch, after_batch, _ = builder.apply(inventory)
+        before_batch, after_batch, _ = builder.apply(inventory, verify=not args.skip_verify)
     except Exception as exc:  # pylint: disable=broad-except
         log.error("Apply failed: %s", exc)
         return 1
 
     print("\n=== Applied changes ===")
-    for line in builder.summarize(before_batch).splitlines():
-        print(line)
+    print(builder.summarize(before_batch))
 
-    print("\n=== Post-apply verification ===")
-    for line in builder.summarize(after_batch).splitlines():
-        print(line)
+    if after_batch is not None:
+        print("\n=== Post-apply verification ===")
+        print(builder.summarize(after_batch))
 
     print("\nNetBox synchronization complete.")
     return 0
 
 
-class _FakeEndpoint:
-    def __init__(self) -> None:
-        self._records: List[_FakeRecord] = []
-
-    def get(self, **kwargs):
-        return None
-
-    def filter(self, **kwargs):
-        return []
-
-    def create(self, payload):
-        record = _FakeRecord(payload)
-        self._records.append(record)
-        return record
-
-
-class _FakeRecord:
-    _next_id = 1
-
-    def __init__(self, data: dict) -> None:
-        self._data = data
-        self.id = _FakeRecord._next_id
-        _FakeRecord._next_id += 1
-
-    def serialize(self):
-        return self._data
-
-    def update(self, payload):
-        self._data.update(payload)
-        return self
-
-
-def _build_fake_netbox_api():
-    endpoints = SimpleNamespace(
-        devices=_FakeEndpoint(),
-        module_bays=_FakeEndpoint(),
-        modules=_FakeEndpoint(),
-        interfaces=_FakeEndpoint(),
-        manufacturers=_FakeEndpoint(),
-        device_types=_FakeEndpoint(),
-        module_types=_FakeEndpoint(),
-        sites=_FakeEndpoint(),
-        device_roles=_FakeEndpoint(),
-    )
-    api = SimpleNamespace(dcim=endpoints)
-    api.http_session = SimpleNamespace(verify=True)
-    return api
-
-
-def _build_sample_inventory(config: AppConfig) -> NormalizedInventory:
-    host_name = "SIM-SROS-01"
-    device_type_raw = "Nokia 7750 SR-7"
-    device = NormalizedDevice(
-        name=host_name,
-        site_slug=config.rules.site_slug(host_name),
-        role_slug=config.rules.role_slug(host_name),
-        manufacturer_slug=config.rules.manufacturer_slug(host_name),
-        device_type_slug=config.rules.device_type_slug(device_type_raw),
-        status="active",
-    )
-
-    module_bays = [
-        NormalizedModuleBay(name="Card A", label="Card A", position="A"),
-        NormalizedModuleBay(name="Card B", label="Card B", position="B"),
-    ]
-
-    modules = [
-        NormalizedModule(bay_name="Card A", module_type_model="mda-imm-24"),
-        NormalizedModule(bay_name="Card B", module_type_model="mda-xc-12"),
-    ]
-
-    lag_name = "LAG 1"
-    interfaces = [
-        NormalizedInterface(
-            name=lag_name,
-            type_slug=config.rules.interface_type(lag_name, is_lag=True),
-            enabled=True,
-            description="Simulated uplink",
-        ),
-        NormalizedInterface(
-            name="1/1/1",
-            type_slug=config.rules.interface_type("1/1/1"),
-            enabled=True,
-            description="Simulated member",
-            lag=lag_name,
-        ),
-        NormalizedInterface(
-            name="1/1/2",
-            type_slug=config.rules.interface_type("1/1/2"),
-            enabled=True,
-            description="Access port",
-        ),
-    ]
-
-    lags = [
-        NormalizedLag(name=lag_name, members=["1/1/1"], description="Simulated bundle"),
-    ]
-
-    return NormalizedInventory(
-        device=device,
-        module_bays=module_bays,
-        modules=modules,
-        interfaces=interfaces,
-        lags=lags,
-    )
-
-
 if __name__ == "__main__":
     sys.exit(main())
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional
 
 
 __all__ = [
+    "DEVICE_TYPE_ALIASES",
+    "DEVICE_OS_CHOICES",
     "NormalizedDevice",
     "NormalizedModuleBay",
     "NormalizedModule",
@@ -17,6 +20,41 @@ __all__ = [
 ]
 
 
+# Netmiko device types supported by the collector, grouped by Netmiko driver.
+# Kept here, free of any netmiko import, so the NetBox script form can list
+# them without loading netmiko.
+DEVICE_TYPE_ALIASES: Dict[str, List[str]] = {
+    # Nokia - SR OS (SROS)
+    "NokiaSrosSSH": ["nokia_sros"],
+
+    # Fortinet - FortiOS
+    "FortinetSSH": ["fortinet"],
+
+    # HPE / Aruba - Various OSes
+    "HpeComwareSSH": ["hp_comware"],
+    "HpeProcurveSSH": ["hp_procurve"],
+    "ArubaOsSSH": ["aruba_os"],
+    "ArubaCxSSH": ["aruba_os_cx"],
+
+    # Adtran - AOS
+    "AdtranOsSSH": ["adtran_os", "adtran_aos"],
+
+    # MikroTik - RouterOS / SwOS
+    "MikrotikRouterOsSSH": ["mikrotik_routeros"],
+    "MikrotikSwOsSSH": ["mikrotik_swos"],
+
+    # Ubiquiti - EdgeOS / UniFi
+    "UbiquitiEdgeSSH": ["ubiquiti_edge", "ubiquiti_edgeswitch", "ubiquiti_edgemax"],
+    "UbiquitiUnifiSSH": ["ubiquiti_unifi", "unifi_os"],
+}
+
+DEVICE_OS_CHOICES = tuple(
+    (netmiko_type, netmiko_type)
+    for type_list in DEVICE_TYPE_ALIASES.values()
+    for netmiko_type in type_list
+)
+
+
 @dataclass(slots=True)
 class NormalizedDevice:
     name: str
@@ -97,14 +135,12 @@ class ProposalBatch:
     interfaces: List[Proposal] = field(default_factory=list)
     lags: List[Proposal] = field(default_factory=list)
 
-    def actions(self) -> List[Proposal]:
-        return [
-            self.device,
-            *self.module_bays,
-            *self.modules,
-            *self.interfaces,
-            *self.lags,
-        ]
+    def actions(self) -> Iterator[Proposal]:
+        return chain((self.device,), self.module_bays, self.modules, self.interfaces, self.lags)
+
+    def has_updates(self) -> bool:
+        """True if any proposal would change an existing object; stops at the first one."""
+        return any(proposal.action == "update" for proposal in self.actions())
 
     def to_json(self) -> Dict[str, Any]:
         return {
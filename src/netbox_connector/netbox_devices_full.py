@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import functools
 import json
 import logging
-from dataclasses import dataclass, replace
+import re
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import pynetbox
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
+
 from .config_loader import AppConfig, load_app_config
 from .models import NormalizedInventory, Proposal, ProposalBatch
 
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on objects sent in one bulk POST to keep request bodies small.
+BULK_CHUNK_SIZE = 100
+
 __all__ = [
     "slugify",
     "DeviceState",
@@ -23,20 +36,51 @@ __all__ = [
 ]
 
 
+# Runs of anything str.isalnum() rejects; \W already excludes letters and digits
+# in every script, the underscore has to be listed separately.
+_RE_SLUG_SEPARATORS = re.compile(r"[\W_]+")
+
+
+@functools.lru_cache(maxsize=1024)
 def slugify(value: str) -> str:
-    cleaned = value.strip().lower()
-    result = "".join(ch if ch.isalnum() else "-" for ch in cleaned)
-    while "--" in result:
-        result = result.replace("--", "-")
-    return result.strip("-")
+    return _RE_SLUG_SEPARATORS.sub("-", value.strip().lower()).strip("-")
+
+
+_by_name = attrgetter("name")
+_by_action = attrgetter("action")
+
+# (endpoint, NormalizedDevice field) pairs for the reference objects a device points at.
+_REFERENCE_SLUG_FIELDS = (
+    ("sites", attrgetter("site_slug")),
+    ("device_roles", attrgetter("role_slug")),
+    ("device_types", attrgetter("device_type_slug")),
+    ("manufacturers", attrgetter("manufacturer_slug")),
+)
+
+
+def _choice_value(choice) -> Optional[str]:
+    """Return the ``value`` of a NetBox choice field such as ``type`` or ``status``."""
+    return getattr(choice, "value", choice) if choice else None
+
+
+def _nested_attr(record, attribute: str):
+    """Read ``attribute`` from a nested record (e.g. ``lag.name``), tolerating None."""
+    return getattr(record, attribute, None) if record else None
 
 
 @dataclass(slots=True)
 class DeviceState:
+    # Each dict is already in the "current" shape the matching proposal
+    # compares against, keyed by bay or interface name.
     module_bays: Dict[str, Dict]
     modules: Dict[str, Dict]
     interfaces: Dict[str, Dict]
     lag_membership: Dict[str, Set[str]]
+    # Records behind the serialized dicts above, so apply() can update them
+    # without fetching each object again.
+    module_bay_records: Dict[str, Any] = field(default_factory=dict)
+    module_records: Dict[str, Any] = field(default_factory=dict)
+    interface_records: Dict[str, Any] = field(default_factory=dict)
 
 
 class ProposalEngine:
@@ -44,6 +88,12 @@ class ProposalEngine:
         self.nb = nb
 
     def build(self, inventory: NormalizedInventory) -> ProposalBatch:
+        return self.build_with_state(inventory)[0]
+
+    def build_with_state(
+        self, inventory: NormalizedInventory
+    ) -> Tuple[ProposalBatch, Optional[pynetbox.core.response.Record], Optional[DeviceState]]:
+        """Build proposals and also return the device record and state they were diffed against."""
         existing_device = self.nb.dcim.devices.get(name=inventory.device.name)
         state = self._load_state(existing_device) if existing_device else None
 
@@ -53,13 +103,14 @@ class ProposalEngine:
         interface_proposals = self._interfaces_proposals(inventory.interfaces, state)
         lag_proposals = self._lag_proposals(inventory.lags, state)
 
-        return ProposalBatch(
+        batch = ProposalBatch(
             device=device_proposal,
             module_bays=module_bay_proposals,
             modules=module_proposals,
             interfaces=interface_proposals,
             lags=lag_proposals,
         )
+        return batch, existing_device, state
 
     def _device_proposal(self, inventory: NormalizedInventory, existing_device: Optional[pynetbox.core.response.Record]) -> Proposal:
         device = inventory.device
@@ -78,18 +129,20 @@ class ProposalEngine:
 
         current = None
         if existing_device:
-            data = existing_device.serialize()
+            # Read the Record attributes directly: serialize() flattens nested
+            # objects to ids, which would drop the slugs compared below.
+            device_type = existing_device.device_type
             current = {
-                "name": data.get("name"),
-                "status": (data.get("status") or {}).get("value"),
-                "site": (data.get("site") or {}).get("slug"),
-                "role": (data.get("role") or {}).get("slug"),
-                "device_type": (data.get("device_type") or {}).get("slug"),
-                "manufacturer": (data.get("device_type") or {}).get("manufacturer", {}).get("slug"),
-                "serial": data.get("serial"),
-                "asset_tag": data.get("asset_tag"),
-                "tags": [tag.get("slug") for tag in data.get("tags", [])],
-                "custom_fields": data.get("custom_fields"),
+                "name": existing_device.name,
+                "status": _choice_value(existing_device.status),
+                "site": _nested_attr(existing_device.site, "slug"),
+                "role": _nested_attr(existing_device.role, "slug"),
+                "device_type": _nested_attr(device_type, "slug"),
+                "manufacturer": _nested_attr(_nested_attr(device_type, "manufacturer"), "slug"),
+                "serial": existing_device.serial,
+                "asset_tag": existing_device.asset_tag,
+                "tags": [tag.slug for tag in existing_device.tags or ()],
+                "custom_fields": existing_device.custom_fields,
             }
 
         action, diff = self._action_and_diff(desired, current, existing_device is not None)
@@ -109,15 +162,8 @@ class ProposalEngine:
             "label": bay.label or bay.name,
             "position": bay.position,
         }
-        existing = (state.module_bays.get(bay.name) if state else None)
-        current = None
-        if existing:
-            current = {
-                "name": existing.get("name"),
-                "label": existing.get("label"),
-                "position": existing.get("position"),
-            }
-        action, diff = self._action_and_diff(desired, current, existing is not None)
+        current = state.module_bays.get(bay.name) if state else None
+        action, diff = self._action_and_diff(desired, current, current is not None)
         return Proposal(
             action=action,
             model="module_bay",
@@ -134,16 +180,8 @@ class ProposalEngine:
             "status": module.status,
             "serial": module.serial,
         }
-        existing = (state.modules.get(module.bay_name) if state else None)
-        current = None
-        if existing:
-            current = {
-                "bay_name": (existing.get("module_bay") or {}).get("name"),
-                "module_type_model": (existing.get("module_type") or {}).get("model"),
-                "status": (existing.get("status") or {}).get("value"),
-                "serial": existing.get("serial"),
-            }
-        action, diff = self._action_and_diff(desired, current, existing is not None)
+        current = state.modules.get(module.bay_name) if state else None
+        action, diff = self._action_and_diff(desired, current, current is not None)
         identifier = f"{module.bay_name}:{module.module_type_model}"
         return Proposal(
             action=action,
@@ -157,8 +195,14 @@ class ProposalEngine:
     def _interfaces_proposals(self, interfaces, state: Optional[DeviceState]) -> List[Proposal]:
         existing_map = state.interfaces if state else {}
         proposals: List[Proposal] = []
-        sorted_interfaces = sorted(interfaces, key=lambda iface: (iface.type_slug != "lag", iface.name))
-        for iface in sorted_interfaces:
+        # LAGs first so members can reference them, each group ordered by name.
+        lag_interfaces: List = []
+        other_interfaces: List = []
+        for iface in interfaces:
+            (lag_interfaces if iface.type_slug == "lag" else other_interfaces).append(iface)
+        lag_interfaces.sort(key=_by_name)
+        other_interfaces.sort(key=_by_name)
+        for iface in chain(lag_interfaces, other_interfaces):
             desired = {
                 "type": iface.type_slug,
                 "enabled": iface.enabled,
@@ -167,19 +211,8 @@ class ProposalEngine:
             if iface.lag:
                 desired["lag"] = iface.lag
 
-            existing = existing_map.get(iface.name)
-            current = None
-            if existing:
-                current = {
-                    "type": (existing.get("type") or {}).get("value"),
-                    "enabled": existing.get("enabled"),
-                    "description": existing.get("description"),
-                }
-                lag = existing.get("lag")
-                if lag and lag.get("name"):
-                    current["lag"] = lag.get("name")
-
-            action, diff = self._action_and_diff(desired, current, existing is not None)
+            current = existing_map.get(iface.name)
+            action, diff = self._action_and_diff(desired, current, current is not None)
             proposals.append(
                 Proposal(
                     action=action,
@@ -199,17 +232,17 @@ class ProposalEngine:
         interfaces = state.interfaces if state else {}
         proposals: List[Proposal] = []
         for lag in lags:
-            desired_members = sorted(set(lag.members))
+            desired = {"members": sorted(set(lag.members))}
             current_members = sorted(membership.get(lag.name, set()))
             current = {"members": current_members} if current_members else None
             exists = lag.name in interfaces
-            action, diff = self._action_and_diff({"members": desired_members}, current, exists)
+            action, diff = self._action_and_diff(desired, current, exists)
             proposals.append(
                 Proposal(
                     action=action,
                     model="lag",
                     identifier=lag.name,
-                    desired={"members": desired_members},
+                    desired=desired,
                     current=current,
                     diff=diff,
                 )
@@ -217,44 +250,68 @@ class ProposalEngine:
         return proposals
 
     def _load_state(self, device: pynetbox.core.response.Record) -> DeviceState:
+        # Fields are read straight off the records: serialize() would copy
+        # every field and flatten nested objects (lag, module_bay, ...) to ids,
+        # losing the names the proposals compare on.
         module_bays: Dict[str, Dict] = {}
+        module_bay_records: Dict[str, Any] = {}
         for record in self.nb.dcim.module_bays.filter(device_id=device.id, limit=0):
-            data = record.serialize()
-            module_bays[data["name"]] = data
+            module_bays[record.name] = {
+                "name": record.name,
+                "label": record.label,
+                "position": record.position,
+            }
+            module_bay_records[record.name] = record
 
         modules: Dict[str, Dict] = {}
+        module_records: Dict[str, Any] = {}
         for record in self.nb.dcim.modules.filter(device_id=device.id, limit=0):
-            data = record.serialize()
-            bay = (data.get("module_bay") or {}).get("name")
+            bay = _nested_attr(record.module_bay, "name")
             if bay:
-                modules[bay] = data
+                modules[bay] = {
+                    "bay_name": bay,
+                    "module_type_model": _nested_attr(record.module_type, "model"),
+                    "status": _choice_value(record.status),
+                    "serial": record.serial,
+                }
+                module_records[bay] = record
 
         interfaces: Dict[str, Dict] = {}
+        interface_records: Dict[str, Any] = {}
         lag_membership: Dict[str, Set[str]] = {}
         for record in self.nb.dcim.interfaces.filter(device_id=device.id, limit=0):
-            data = record.serialize()
-            interfaces[data["name"]] = data
-            lag = data.get("lag")
-            if lag and lag.get("name"):
-                lag_membership.setdefault(lag["name"], set()).add(data["name"])
+            name = record.name
+            current = {
+                "type": _choice_value(record.type),
+                "enabled": record.enabled,
+                "description": record.description,
+            }
+            lag_name = _nested_attr(record.lag, "name")
+            if lag_name:
+                current["lag"] = lag_name
+                lag_membership.setdefault(lag_name, set()).add(name)
+            interfaces[name] = current
+            interface_records[name] = record
 
         return DeviceState(
             module_bays=module_bays,
             modules=modules,
             interfaces=interfaces,
             lag_membership=lag_membership,
+            module_bay_records=module_bay_records,
+            module_records=module_records,
+            interface_records=interface_records,
         )
 
     @staticmethod
     def _diff(desired: Dict, current: Optional[Dict]) -> Dict:
         if current is None:
             return {k: v for k, v in desired.items() if v is not None}
-        diff: Dict = {}
-        for key, value in desired.items():
-            current_value = current.get(key) if current else None
-            if current_value != value:
-                diff[key] = value
-        return diff
+        if desired == current:
+            # Common case on re-runs; one C-level dict compare instead of a
+            # per-key loop.
+            return {}
+        return {key: value for key, value in desired.items() if current.get(key) != value}
 
     def _action_and_diff(self, desired: Dict, current: Optional[Dict], exists: bool) -> Tuple[str, Optional[Dict]]:
         if not exists:
@@ -272,6 +329,11 @@ class NetboxDeviceBuilder:
         self.nb = nb_api or pynetbox.api(self.config.netbox.url, token=self.config.netbox.token)
         self.nb.http_session.verify = self.config.netbox.verify_ssl
         self.proposal_engine = ProposalEngine(self.nb)
+        # Shared reference objects (sites, roles, types, ...) rarely change
+        # during a run; only successful lookups are kept so a missing object
+        # that gets created later is still picked up.
+        self._slug_lookup_cache: Dict[Tuple[str, str], Any] = {}
+        self._module_type_cache: Dict[Tuple[str, Any], Any] = {}
 
     def plan(self, inventory: NormalizedInventory) -> Tuple[ProposalBatch, NormalizedInventory]:
         resolved_inventory = self._apply_suffixes(inventory)
@@ -281,42 +343,157 @@ class NetboxDeviceBuilder:
     def dry_run(self, inventory: NormalizedInventory, save_json: bool = True) -> Tuple[ProposalBatch, Optional[Path], str]:
         batch, resolved_inventory = self.plan(inventory)
         output_path = self._write_proposals(batch, resolved_inventory.device.name) if save_json else None
+        summary = self._dry_run_summary(batch, resolved_inventory)
+        return batch, output_path, summary
+
+    def dry_run_many(
+        self, inventories: Iterable[NormalizedInventory], save_json: bool = True
+    ) -> Tuple[List[Tuple[ProposalBatch, str]], Optional[Path]]:
+        """Dry-run several devices and save all their proposals to one JSON Lines file.
+
+        Returns ``(batch, summary)`` per inventory, in order, and the file path.
+        """
+        results: List[Tuple[ProposalBatch, str]] = []
+        named_batches: List[Tuple[ProposalBatch, str]] = []
+        resolved_inventories = [self._apply_suffixes(inventory) for inventory in inventories]
+        self._prefetch_references(inventory.device for inventory in resolved_inventories)
+        for resolved_inventory in resolved_inventories:
+            batch = self.proposal_engine.build(resolved_inventory)
+            named_batches.append((batch, resolved_inventory.device.name))
+            results.append((batch, self._dry_run_summary(batch, resolved_inventory)))
+        output_path = self._write_proposals_batched(named_batches) if save_json and named_batches else None
+        return results, output_path
+
+    def _dry_run_summary(self, batch: ProposalBatch, resolved_inventory: NormalizedInventory) -> str:
         summary = self._summarize(batch)
         preflight = self._build_preflight_report(resolved_inventory)
         if preflight:
             summary = f"{summary}\n\n{preflight}"
         logger.info("Dry-run complete for %s", resolved_inventory.device.name)
-        return batch, output_path, summary
+        return summary
 
     def apply(
-        self, inventory: NormalizedInventory
-    ) -> Tuple[ProposalBatch, ProposalBatch, NormalizedInventory]:
-        batch, resolved_inventory = self.plan(inventory)
+        self, inventory: NormalizedInventory, verify: bool = True
+    ) -> Tuple[ProposalBatch, Optional[ProposalBatch], NormalizedInventory]:
+        """Push ``inventory`` to NetBox.
+
+        Returns the applied batch, the batch re-planned against NetBox afterwards
+        (None when ``verify`` is False, which saves reloading the device), and
+        the inventory with name/type suffixes resolved.
+        """
+        resolved_inventory = self._apply_suffixes(inventory)
+        batch, existing_device, state = self.proposal_engine.build_with_state(resolved_inventory)
+        state = state or DeviceState(module_bays={}, modules={}, interfaces={}, lag_membership={})
 
         dependencies = self._resolve_device_dependencies(resolved_inventory.device)
-        device_record = self._apply_device(batch.device, dependencies)
-
-        module_bay_cache: Dict[str, Any] = {}
+        device_record = self._apply_device(batch.device, dependencies, existing_device)
+
+        # Existing objects come from the records loaded while planning; the
+        # caches below only grow with what this run creates or updates.
+        module_bay_cache = dict(state.module_bay_records)
+        module_bay_cache.update(self._bulk_create(
+            self.nb.dcim.module_bays,
+            "module bay",
+            [
+                (proposal.identifier, self._module_bay_create_payload(device_record, proposal))
+                for proposal in batch.module_bays
+                if proposal.action == "create"
+            ],
+        ))
+        module_bay_updates = []
         for proposal in batch.module_bays:
-            record = self._apply_module_bay(device_record, proposal)
-            if record:
-                module_bay_cache[proposal.identifier] = record
+            if proposal.action == "create":
+                continue
+            record, payload = self._module_bay_update(device_record, proposal, state)
+            if payload:
+                module_bay_updates.append((proposal.identifier, record, payload))
+        module_bay_cache.update(
+            self._bulk_update(self.nb.dcim.module_bays, "module bay", module_bay_updates)
+        )
 
-        module_cache: Dict[str, Any] = {}
+        # Resolve every module type this run may need with one query; misses
+        # are left for _find_module_type to report when the module is applied.
+        self._prefetch_module_types(
+            {
+                proposal.desired["module_type_model"]
+                for proposal in batch.modules
+                if proposal.action != "noop" and proposal.desired.get("module_type_model")
+            },
+            dependencies.get("manufacturer"),
+        )
+        self._bulk_create(
+            self.nb.dcim.modules,
+            "module",
+            [
+                (
+                    proposal.identifier,
+                    self._module_create_payload(device_record, proposal, dependencies, module_bay_cache),
+                )
+                for proposal in batch.modules
+                if proposal.action == "create"
+            ],
+        )
+        module_updates = []
         for proposal in batch.modules:
-            record = self._apply_module(device_record, proposal, dependencies, module_bay_cache)
-            if record:
-                module_cache[proposal.identifier] = record
-
-        interface_cache: Dict[str, Any] = {}
+            if proposal.action == "create":
+                continue
+            record, payload = self._module_update(
+                device_record, proposal, dependencies, module_bay_cache, state
+            )
+            if payload:
+                module_updates.append((proposal.identifier, record, payload))
+        self._bulk_update(self.nb.dcim.modules, "module", module_updates)
+
+        # LAG interfaces are created in their own batch first so that member
+        # payloads can reference the new LAG ids.
+        lag_names = {p.desired["lag"] for p in batch.interfaces if p.desired.get("lag")}
+        lag_creates: List[Proposal] = []
+        member_creates: List[Proposal] = []
         for proposal in batch.interfaces:
-            record = self._apply_interface(device_record, proposal, interface_cache)
-            if record:
-                interface_cache[proposal.identifier] = record
+            if proposal.action != "create":
+                continue
+            if proposal.identifier in lag_names or proposal.desired.get("type") == "lag":
+                lag_creates.append(proposal)
+            else:
+                member_creates.append(proposal)
+        interface_cache: Dict[str, Any] = dict(state.interface_records)
+        for phase in (lag_creates, member_creates):
+            interface_cache.update(
+                self._bulk_create(
+                    self.nb.dcim.interfaces,
+                    "interface",
+                    [
+                        (
+                            proposal.identifier,
+                            self._interface_payload(
+                                device_record, proposal.identifier, proposal.desired, True, interface_cache
+                            ),
+                        )
+                        for proposal in phase
+                    ],
+                )
+            )
+        interface_updates = []
+        for proposal in batch.interfaces:
+            if proposal.action == "create":
+                continue
+            record, payload = self._interface_update(device_record, proposal, interface_cache, state)
+            if payload:
+                interface_updates.append((proposal.identifier, record, payload))
+        interface_cache.update(
+            self._bulk_update(self.nb.dcim.interfaces, "interface", interface_updates)
+        )
 
-        self._apply_lag_membership(device_record, batch.lags)
+        # LAG membership as it stands after the interface writes above, derived
+        # from the loaded state instead of re-querying each LAG's members.
+        interface_lags = {name: data.get("lag") for name, data in state.interfaces.items()}
+        for proposal in batch.interfaces:
+            source = proposal.desired if proposal.action == "create" else proposal.diff or {}
+            if proposal.action != "noop" and "lag" in source:
+                interface_lags[proposal.identifier] = source["lag"]
+        self._apply_lag_membership(device_record, batch.lags, interface_cache, interface_lags)
 
-        post_batch = self.proposal_engine.build(resolved_inventory)
+        post_batch = self.proposal_engine.build(resolved_inventory) if verify else None
         return batch, post_batch, resolved_inventory
 
     def summarize(self, batch: ProposalBatch) -> str:
@@ -341,18 +518,42 @@ class NetboxDeviceBuilder:
         return replace(inventory, device=updated_device)
 
     def _write_proposals(self, batch: ProposalBatch, device_name: str) -> Path:
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        filename = f"{slugify(device_name)}_{timestamp}.json"
+        now = datetime.now(timezone.utc)
+        filename = f"{slugify(device_name)}_{now:%Y%m%dT%H%M%SZ}.json"
         output_path = self.config.netbox.proposals_dir / filename
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(self._encode_proposals(batch, device_name, now.isoformat(), indent=True))
+        return output_path
+
+    def _write_proposals_batched(self, named_batches: List[Tuple[ProposalBatch, str]]) -> Path:
+        """Write one JSON document per line for each ``(batch, device name)`` pair."""
+        now = datetime.now(timezone.utc)
+        output_path = self.config.netbox.proposals_dir / f"fleet_{now:%Y%m%dT%H%M%SZ}.jsonl"
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        generated_at = now.isoformat()
+        with output_path.open("wb") as handle:
+            for batch, device_name in named_batches:
+                handle.write(self._encode_proposals(batch, device_name, generated_at, indent=False))
+                handle.write(b"\n")
+        return output_path
+
+    @staticmethod
+    def _encode_proposals(
+        batch: ProposalBatch, device_name: str, generated_at: str, indent: bool
+    ) -> bytes:
+        if orjson is not None:
+            # orjson walks the slotted dataclasses itself, in field order, so the
+            # intermediate dicts from to_json() are never built.
+            payload = {"device": device_name, "generated_at": generated_at, "proposals": batch}
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(payload, option=option)
+
         payload = {
             "device": device_name,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at,
             "proposals": batch.to_json(),
         }
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
-        return output_path
+        return json.dumps(payload, indent=2 if indent else None).encode("utf-8")
 
     def _summarize(self, batch: ProposalBatch) -> str:
         lines = [f"Device -> {batch.device.action.upper()}: {batch.device.identifier}"]
@@ -366,11 +567,9 @@ class NetboxDeviceBuilder:
         issues: List[str] = []
 
         manufacturer_slug = inventory.device.manufacturer_slug
-        manufacturer_endpoint = getattr(self.nb.dcim, "manufacturers", None)
         manufacturer_record = None
         if manufacturer_slug:
-            if manufacturer_endpoint:
-                manufacturer_record = manufacturer_endpoint.get(slug=manufacturer_slug)
+            manufacturer_record = self._get_by_slug("manufacturers", manufacturer_slug)
             if not manufacturer_record:
                 issues.append(
                     f"Manufacturer slug '{manufacturer_slug}' not found in NetBox."
@@ -379,8 +578,7 @@ class NetboxDeviceBuilder:
             issues.append("Device manufacturer slug is missing; update rules defaults.")
 
         device_type_slug = inventory.device.device_type_slug
-        device_type_endpoint = getattr(self.nb.dcim, "device_types", None)
-        device_type = device_type_endpoint.get(slug=device_type_slug) if device_type_endpoint else None
+        device_type = self._get_by_slug("device_types", device_type_slug)
         if not device_type:
             issues.append(f"Device type slug '{device_type_slug}' not found in NetBox.")
 
@@ -389,12 +587,7 @@ class NetboxDeviceBuilder:
             for module in inventory.modules
             if module.module_type_model
         }
-        missing_modules: List[str] = []
-        for model in sorted(module_models):
-            try:
-                self._find_module_type(model, manufacturer_record)
-            except ValueError:
-                missing_modules.append(model)
+        missing_modules = self._prefetch_module_types(module_models, manufacturer_record)
 
         if missing_modules:
             formatted = ", ".join(missing_modules)
@@ -411,23 +604,54 @@ class NetboxDeviceBuilder:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _get_by_slug(self, endpoint_name: str, slug: str):
+        key = (endpoint_name, slug)
+        record = self._slug_lookup_cache.get(key)
+        if record is None:
+            endpoint = getattr(self.nb.dcim, endpoint_name, None)
+            record = endpoint.get(slug=slug) if endpoint else None
+            if record:
+                self._slug_lookup_cache[key] = record
+        return record
+
+    def _prefetch_references(self, devices: Iterable[Any]) -> None:
+        """Cache the sites, roles, device types and manufacturers ``devices`` refer to.
+
+        One ``slug`` filter per endpoint replaces a ``get`` per distinct slug;
+        slugs that are not found are left for ``_get_by_slug`` to report.
+        """
+        devices = list(devices)
+        for endpoint_name, slug_of in _REFERENCE_SLUG_FIELDS:
+            pending = sorted(
+                {
+                    slug
+                    for slug in map(slug_of, devices)
+                    if slug and (endpoint_name, slug) not in self._slug_lookup_cache
+                }
+            )
+            endpoint = getattr(self.nb.dcim, endpoint_name, None)
+            if not pending or endpoint is None:
+                continue
+            for record in endpoint.filter(slug=pending, limit=0):
+                self._slug_lookup_cache[(endpoint_name, record.slug)] = record
+
     def _resolve_device_dependencies(self, device) -> Dict[str, Any]:
-        site = self.nb.dcim.sites.get(slug=device.site_slug)
+        site = self._get_by_slug("sites", device.site_slug)
         if not site:
             raise ValueError(f"Site with slug '{device.site_slug}' not found in NetBox")
 
-        role = self.nb.dcim.device_roles.get(slug=device.role_slug)
+        role = self._get_by_slug("device_roles", device.role_slug)
         if not role:
             raise ValueError(f"Device role with slug '{device.role_slug}' not found in NetBox")
 
-        device_type = self.nb.dcim.device_types.get(slug=device.device_type_slug)
+        device_type = self._get_by_slug("device_types", device.device_type_slug)
         if not device_type:
             raise ValueError(f"Device type with slug '{device.device_type_slug}' not found in NetBox")
 
         manufacturer_slug = device.manufacturer_slug
         manufacturer = None
         if manufacturer_slug:
-            manufacturer = self.nb.dcim.manufacturers.get(slug=manufacturer_slug)
+            manufacturer = self._get_by_slug("manufacturers", manufacturer_slug)
             if not manufacturer:
                 raise ValueError(
                     f"Manufacturer with slug '{manufacturer_slug}' not found in NetBox"
@@ -445,9 +669,7 @@ class NetboxDeviceBuilder:
             "manufacturer": manufacturer,
         }
 
-    def _apply_device(self, proposal: Proposal, dependencies: Dict[str, Any]):
-        existing = self.nb.dcim.devices.get(name=proposal.identifier)
-
+    def _apply_device(self, proposal: Proposal, dependencies: Dict[str, Any], existing):
         if proposal.action == "create":
             payload = self._build_device_payload(proposal.desired, dependencies)
             device = self.nb.dcim.devices.create(payload)
@@ -460,193 +682,258 @@ class NetboxDeviceBuilder:
         if proposal.action == "update":
             payload = self._build_device_payload(proposal.diff or {}, dependencies)
             if payload:
-                existing = existing.update(payload)
+                existing.update(payload)
                 logger.info("Updated device %s", proposal.identifier)
         return existing
 
-    def _apply_module_bay(self, device, proposal: Proposal):
-        existing = self.nb.dcim.module_bays.get(device_id=device.id, name=proposal.identifier)
-        if proposal.action == "create":
-            create_payload = {
-                key: value
-                for key, value in proposal.desired.items()
-                if key in {"name", "label", "position"} and value is not None
-            }
-            data = {"device": device.id, **create_payload}
-            record = self.nb.dcim.module_bays.create(data)
-            logger.info("Created module bay %s", proposal.identifier)
-            return record
+    def _bulk_create(
+        self, endpoint, label: str, items: List[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Create ``items`` (identifier, payload) via bulk POSTs and map identifiers to records."""
+        records: Dict[str, Any] = {}
+        for start in range(0, len(items), BULK_CHUNK_SIZE):
+            chunk = items[start:start + BULK_CHUNK_SIZE]
+            created = endpoint.create([payload for _, payload in chunk])
+            for (identifier, _), record in zip(chunk, created):
+                records[identifier] = record
+                logger.info("Created %s %s", label, identifier)
+        return records
+
+    def _bulk_update(
+        self, endpoint, label: str, items: List[Tuple[str, Any, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """PATCH ``items`` (identifier, record, changes) via bulk updates and map identifiers to records."""
+        records: Dict[str, Any] = {}
+        for start in range(0, len(items), BULK_CHUNK_SIZE):
+            chunk = items[start:start + BULK_CHUNK_SIZE]
+            updated = endpoint.update([{"id": record.id, **payload} for _, record, payload in chunk])
+            for (identifier, _, _), record in zip(chunk, updated):
+                records[identifier] = record
+                logger.info("Updated %s %s", label, identifier)
+        return records
 
+    @staticmethod
+    def _module_bay_create_payload(device, proposal: Proposal) -> Dict[str, Any]:
+        create_payload = {
+            key: value
+            for key, value in proposal.desired.items()
+            if key in {"name", "label", "position"} and value is not None
+        }
+        return {"device": device.id, **create_payload}
+
+    def _module_bay_update(self, device, proposal: Proposal, state: DeviceState):
+        """Return the existing module bay and the fields to PATCH (empty for a noop)."""
+        existing = state.module_bay_records.get(proposal.identifier)
         if not existing:
             if proposal.action == "noop":
-                return None
+                return None, {}
             raise ValueError(f"Module bay '{proposal.identifier}' not found for device {device.name}")
 
-        if proposal.action == "update":
-            diff = proposal.diff or {}
-            update_payload = {key: diff[key] for key in diff if key in {"name", "label", "position"}}
-            if update_payload:
-                existing = existing.update(update_payload)
-                logger.info("Updated module bay %s", proposal.identifier)
-        return existing
+        if proposal.action != "update":
+            return existing, {}
+        diff = proposal.diff or {}
+        return existing, {key: diff[key] for key in diff if key in {"name", "label", "position"}}
 
-    def _apply_module(
-        self,
-        device,
-        proposal: Proposal,
-        dependencies: Dict[str, Any],
-        module_bays: Dict[str, Any],
-    ):
-        bay_name = proposal.desired.get("bay_name")
-        module_type_model = proposal.desired.get("module_type_model")
+    def _resolve_module_bay(self, device, bay_name: Optional[str], module_bays: Dict[str, Any]):
         module_bay = module_bays.get(bay_name)
         if not module_bay:
             module_bay = self.nb.dcim.module_bays.get(device_id=device.id, name=bay_name)
             if not module_bay:
                 raise ValueError(f"Module bay '{bay_name}' not found when applying modules")
             module_bays[bay_name] = module_bay
+        return module_bay
 
-        manufacturer = dependencies.get("manufacturer")
-        module_type = None
-        needs_module_type = proposal.action == "create" or (
-            (proposal.diff or {}).get("module_type_model") is not None
+    def _module_create_payload(
+        self,
+        device,
+        proposal: Proposal,
+        dependencies: Dict[str, Any],
+        module_bays: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        module_bay = self._resolve_module_bay(device, proposal.desired.get("bay_name"), module_bays)
+        module_type = self._find_module_type(
+            proposal.desired.get("module_type_model"), dependencies.get("manufacturer")
         )
-        if needs_module_type:
-            module_type = self._find_module_type(module_type_model, manufacturer)
+        payload = {
+            "device": device.id,
+            "module_bay": module_bay.id,
+            "module_type": module_type.id,
+        }
+        if proposal.desired.get("status"):
+            payload["status"] = proposal.desired["status"]
+        if proposal.desired.get("serial") is not None:
+            payload["serial"] = proposal.desired.get("serial")
+        return payload
 
-        existing = None
-        module_identifier = proposal.identifier
-        existing_modules = list(
-            self.nb.dcim.modules.filter(device_id=device.id, module_bay_id=module_bay.id, limit=1)
-        )
-        if existing_modules:
-            existing = existing_modules[0]
+    def _module_update(
+        self,
+        device,
+        proposal: Proposal,
+        dependencies: Dict[str, Any],
+        module_bays: Dict[str, Any],
+        state: DeviceState,
+    ):
+        """Return the existing module and the fields to PATCH (empty for a noop)."""
+        bay_name = proposal.desired.get("bay_name")
+        module_type_model = proposal.desired.get("module_type_model")
+        module_bay = self._resolve_module_bay(device, bay_name, module_bays)
 
-        if proposal.action == "create":
-            if not module_type:
-                module_type = self._find_module_type(module_type_model, manufacturer)
-            payload = {
-                "device": device.id,
-                "module_bay": module_bay.id,
-                "module_type": module_type.id,
-            }
-            if proposal.desired.get("status"):
-                payload["status"] = proposal.desired["status"]
-            if proposal.desired.get("serial") is not None:
-                payload["serial"] = proposal.desired.get("serial")
-            record = self.nb.dcim.modules.create(payload)
-            logger.info("Created module %s", module_identifier)
-            return record
+        module_identifier = proposal.identifier
+        existing = state.module_records.get(bay_name)
+        if existing is not None and getattr(existing.module_bay, "id", None) != module_bay.id:
+            existing = None
 
         if not existing:
             if proposal.action == "noop":
-                return None
+                return None, {}
             raise ValueError(f"Module '{module_identifier}' not found for device {device.name}")
 
+        update_payload: Dict[str, Any] = {}
         if proposal.action == "update":
-            update_payload = {}
             for key, value in (proposal.diff or {}).items():
                 if key == "module_type_model":
-                    if not module_type:
-                        module_type = self._find_module_type(module_type_model, manufacturer)
+                    module_type = self._find_module_type(
+                        module_type_model, dependencies.get("manufacturer")
+                    )
                     update_payload["module_type"] = module_type.id
                 elif key == "status":
                     update_payload["status"] = value
                 elif key == "serial":
                     update_payload["serial"] = value
-            if update_payload:
-                existing = existing.update(update_payload)
-                logger.info("Updated module %s", module_identifier)
-        return existing
-
-    def _apply_interface(self, device, proposal: Proposal, cache: Dict[str, Any]):
-        desired = proposal.desired
-        existing = self.nb.dcim.interfaces.get(device_id=device.id, name=proposal.identifier)
-
-        def to_payload(source: Dict[str, Any], include_identity: bool) -> Dict[str, Any]:
-            payload: Dict[str, Any] = {}
-            if include_identity:
-                payload["device"] = device.id
-                payload["name"] = proposal.identifier
-            if "type" in source:
-                payload["type"] = source["type"]
-            if "enabled" in source:
-                payload["enabled"] = source["enabled"]
-            if "description" in source:
-                payload["description"] = source["description"]
-            if "lag" in source:
-                lag_name = source["lag"]
-                if lag_name:
-                    lag_iface = cache.get(lag_name) or self.nb.dcim.interfaces.get(
-                        device_id=device.id, name=lag_name
-                    )
-                    if not lag_iface:
-                        raise ValueError(f"Referenced LAG '{lag_name}' not found for {proposal.identifier}")
-                    cache[lag_name] = lag_iface
-                    payload["lag"] = lag_iface.id
-                else:
-                    payload["lag"] = None
-            return payload
+        return existing, update_payload
 
-        if proposal.action == "create":
-            payload = to_payload(desired, include_identity=True)
-            record = self.nb.dcim.interfaces.create(payload)
-            logger.info("Created interface %s", proposal.identifier)
-            return record
+    def _interface_payload(
+        self,
+        device,
+        identifier: str,
+        source: Dict[str, Any],
+        include_identity: bool,
+        cache: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {}
+        if include_identity:
+            payload["device"] = device.id
+            payload["name"] = identifier
+        if "type" in source:
+            payload["type"] = source["type"]
+        if "enabled" in source:
+            payload["enabled"] = source["enabled"]
+        if "description" in source:
+            payload["description"] = source["description"]
+        if "lag" in source:
+            lag_name = source["lag"]
+            if lag_name:
+                lag_iface = cache.get(lag_name) or self.nb.dcim.interfaces.get(
+                    device_id=device.id, name=lag_name
+                )
+                if not lag_iface:
+                    raise ValueError(f"Referenced LAG '{lag_name}' not found for {identifier}")
+                cache[lag_name] = lag_iface
+                payload["lag"] = lag_iface.id
+            else:
+                payload["lag"] = None
+        return payload
 
+    def _interface_update(self, device, proposal: Proposal, cache: Dict[str, Any], state: DeviceState):
+        """Return the existing interface and the fields to PATCH (empty for a noop)."""
+        existing = state.interface_records.get(proposal.identifier)
         if not existing:
             if proposal.action == "noop":
-                return None
+                return None, {}
             raise ValueError(f"Interface '{proposal.identifier}' not found on device {device.name}")
 
-        if proposal.action == "update":
-            payload = to_payload(proposal.diff or {}, include_identity=False)
-            if payload:
-                existing = existing.update(payload)
-                logger.info("Updated interface %s", proposal.identifier)
-        return existing
+        if proposal.action != "update":
+            return existing, {}
+        return existing, self._interface_payload(
+            device, proposal.identifier, proposal.diff or {}, False, cache
+        )
+
+    def _apply_lag_membership(
+        self,
+        device,
+        lag_proposals: Iterable[Proposal],
+        interfaces: Dict[str, Any],
+        interface_lags: Dict[str, Optional[str]],
+    ):
+        # Collected per interface so a port that leaves one LAG and joins
+        # another ends up in the new one regardless of LAG order, and all
+        # changes go out in one bulk PATCH.
+        changes: Dict[str, Tuple[Any, Optional[int], str]] = {}
+        members_by_lag: Dict[str, Set[str]] = {}
+        for name, lag in interface_lags.items():
+            if lag:
+                members_by_lag.setdefault(lag, set()).add(name)
 
-    def _apply_lag_membership(self, device, lag_proposals: Iterable[Proposal]):
         for proposal in lag_proposals:
             if proposal.action == "noop":
                 continue
-            desired_members = proposal.desired.get("members", [])
             lag_name = proposal.identifier
-            lag_iface = self.nb.dcim.interfaces.get(device_id=device.id, name=lag_name)
+            lag_iface = interfaces.get(lag_name) or self.nb.dcim.interfaces.get(
+                device_id=device.id, name=lag_name
+            )
             if not lag_iface:
                 raise ValueError(f"LAG interface '{lag_name}' not found when setting membership")
-            lag_id = lag_iface.id
-
-            current_members = {
-                record.name
-                for record in self.nb.dcim.interfaces.filter(
-                    device_id=device.id, lag_id=lag_id, limit=0
-                )
-            }
 
-            desired_set = set(desired_members)
+            desired_set = set(proposal.desired.get("members", []))
+            current_members = members_by_lag.get(lag_name, set())
 
-            to_add = desired_set - current_members
-            to_remove = current_members - desired_set
+            for member in sorted(current_members - desired_set):
+                iface = interfaces.get(member) or self.nb.dcim.interfaces.get(
+                    device_id=device.id, name=member
+                )
+                if iface and member not in changes:
+                    changes[member] = (iface, None, f"{member} (removed from {lag_name})")
 
-            for member in sorted(to_add):
-                iface = self.nb.dcim.interfaces.get(device_id=device.id, name=member)
+            for member in sorted(desired_set - current_members):
+                iface = interfaces.get(member) or self.nb.dcim.interfaces.get(
+                    device_id=device.id, name=member
+                )
                 if not iface:
                     raise ValueError(f"Interface '{member}' not found while adding to {lag_name}")
-                iface.update({"lag": lag_id})
-                logger.info("Added %s to %s", member, lag_name)
+                changes[member] = (iface, lag_iface.id, f"{member} (added to {lag_name})")
 
-            for member in sorted(to_remove):
-                iface = self.nb.dcim.interfaces.get(device_id=device.id, name=member)
-                if not iface:
-                    continue
-                iface.update({"lag": None})
-                logger.info("Removed %s from %s", member, lag_name)
+        self._bulk_update(
+            self.nb.dcim.interfaces,
+            "LAG member",
+            [(change, iface, {"lag": lag_id}) for iface, lag_id, change in changes.values()],
+        )
 
     def _find_module_type(self, model: Optional[str], manufacturer):
         if not model:
             raise ValueError("Module type model is required")
+        key = (model, getattr(manufacturer, "id", None) if manufacturer else None)
+        cached = self._module_type_cache.get(key)
+        if cached is None:
+            cached = self._module_type_cache[key] = self._lookup_module_type(model, manufacturer)
+        return cached
+
+    def _prefetch_module_types(self, models: Iterable[str], manufacturer) -> List[str]:
+        """Resolve ``models`` with one module_types query, cache the hits and return the misses."""
+        manufacturer_id = getattr(manufacturer, "id", None) if manufacturer else None
+        pending = sorted(model for model in models if (model, manufacturer_id) not in self._module_type_cache)
+        if not pending:
+            return []
+
+        by_model: Dict[str, List[Any]] = {}
+        for candidate in self.nb.dcim.module_types.filter(model=pending, limit=0):
+            by_model.setdefault(candidate.model, []).append(candidate)
+
+        missing: List[str] = []
+        for model in pending:
+            try:
+                module_type = self._pick_module_type(model, by_model.get(model, []), manufacturer)
+            except ValueError:
+                missing.append(model)
+            else:
+                self._module_type_cache[(model, manufacturer_id)] = module_type
+        return missing
+
+    def _lookup_module_type(self, model: str, manufacturer):
         candidates = list(self.nb.dcim.module_types.filter(model=model, limit=5))
+        return self._pick_module_type(model, candidates, manufacturer)
+
+    @staticmethod
+    def _pick_module_type(model: str, candidates: List[Any], manufacturer):
         if manufacturer:
             manufacturer_id = getattr(manufacturer, "id", None)
             candidates = [c for c in candidates if getattr(getattr(c, "manufacturer", None), "id", None) == manufacturer_id]
@@ -695,7 +982,7 @@ class NetboxDeviceBuilder:
 
     @staticmethod
     def _count_actions(proposals: Iterable[Proposal]) -> Dict[str, int]:
+        # Counter tallies in C; seeding the dict keeps create/update/noop order.
         counts: Dict[str, int] = {"create": 0, "update": 0, "noop": 0}
-        for proposal in proposals:
-            counts[proposal.action] = counts.get(proposal.action, 0) + 1
+        counts.update(Counter(map(_by_action, proposals)))
         return {k: v for k, v in counts.items() if v}
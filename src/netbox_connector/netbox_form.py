@@ -28,9 +28,9 @@ else:  # pragma: no cover - executed during local development/testing
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             raise OPTIONAL_IMPORT_ERROR
 
-from .config_loader import load_app_config
-from .netmiko_ssh_handler import NetmikoDataCollector
-from .netbox_devices_full import NetboxDeviceBuilder
+# netmiko, pynetbox and the config loader are imported in run(), so NetBox can
+# list and render this script without loading them.
+from .models import DEVICE_OS_CHOICES
 
 
 class CreateNetmikoTest(Script):
@@ -47,14 +47,7 @@ class CreateNetmikoTest(Script):
         field_order = ["ip", "device_os", "username", "password", "update_existing"]
 
     ip = IPAddressVar(description="Device IP address", label="IP")
-    device_os = ChoiceVar(
-        choices=[
-            (netmiko_type, netmiko_type)
-            for type_list in NetmikoDataCollector.device_type_alias.values()
-            for netmiko_type in type_list
-        ],
-        label="Device OS",
-    )
+    device_os = ChoiceVar(choices=DEVICE_OS_CHOICES, label="Device OS")
     username = StringVar(description="SSH username")
     password = StringVar(description="SSH password", widget=PasswordInput)
     update_existing = BooleanVar(
@@ -63,13 +56,19 @@ class CreateNetmikoTest(Script):
     )
 
     def run(self, data, commit):
-        ip = data["ip"].compressed if hasattr(data["ip"], "compressed") else data["ip"]
+        # IPAddressVar yields a netaddr.IPAddress; str() gives the bare address
+        # for that, for ipaddress objects and for plain strings alike.
+        ip = str(data["ip"])
         username = data["username"]
         password = data["password"]
         device_os = data["device_os"]
 
         self.log_info("Connecting...")
 
+        from .config_loader import load_app_config
+        from .netbox_devices_full import NetboxDeviceBuilder
+        from .netmiko_ssh_handler import NetmikoDataCollector
+
         try:
             config = load_app_config()
         except Exception as failure:  # pylint: disable=broad-except
@@ -77,6 +76,7 @@ class CreateNetmikoTest(Script):
             return
 
         collector = None
+        inventory = None
         try:
             ssh_connect = NetmikoDataCollector.build_ssh_config(ip, username, password, device_os)
             collector = NetmikoDataCollector(ssh_connect, rules=config.rules)
@@ -88,10 +88,9 @@ class CreateNetmikoTest(Script):
             return
         finally:
             if collector is not None:
-                try:
-                    collector.disconnect()
-                except Exception:  # pylint: disable=broad-except
-                    pass
+                # A pooled session is reused by the next run for this device
+                # unless the harvest failed part-way.
+                collector.disconnect(discard=inventory is None)
 
         builder = NetboxDeviceBuilder(config=config)
 
@@ -101,9 +100,7 @@ class CreateNetmikoTest(Script):
             self.log_failure(f"Dry-run failed: {failure}")
             return
 
-        self.log_info("Dry-run summary:")
-        for line in summary.splitlines():
-            self.log_info(line)
+        self._log_block("Dry-run summary:", summary)
         if proposal_path:
             self.log_info(f"Proposal saved to {proposal_path}")
 
@@ -112,8 +109,7 @@ class CreateNetmikoTest(Script):
             return
 
         allow_updates = data.get("update_existing", False)
-        updates_detected = any(action.action == "update" for action in dry_batch.actions())
-        if updates_detected and not allow_updates:
+        if dry_batch.has_updates() and not allow_updates:
             self.log_failure("Updates detected but 'Update existing' is disabled. Aborting apply.")
             return
 
@@ -123,11 +119,12 @@ class CreateNetmikoTest(Script):
             self.log_failure(f"Apply failed: {failure}")
             return
 
-        self.log_info("Applied changes:")
-        for line in builder.summarize(before_batch).splitlines():
-            self.log_info(line)
-
-        self.log_info("Post-apply verification:")
-        for line in builder.summarize(after_batch).splitlines():
-            self.log_info(line)
+        self._log_block("Applied changes:", builder.summarize(before_batch))
+        self._log_block("Post-apply verification:", builder.summarize(after_batch))
         self.log_success("NetBox synchronization complete.")
+
+    def _log_block(self, title: str, text: str) -> None:
+        # One log entry per section keeps each summary together in the job
+        # log; NetBox renders log messages as Markdown, so the code fence
+        # preserves the summary's line breaks and alignment.
+        self.log_info(f"{title}\n```\n{text}\n```")
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import logging
+import os
 import re
-from typing import Dict, List, Optional, Set
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from netmiko import ConnectHandler, NetmikoAuthenticationException, NetmikoTimeoutException
 
 from .config_loader import RulesEngine
 from .models import (
+    DEVICE_OS_CHOICES,
+    DEVICE_TYPE_ALIASES,
     NormalizedDevice,
     NormalizedInterface,
     NormalizedInventory,
@@ -16,36 +26,196 @@ from .models import (
 )
 
 
-__all__ = ["NetmikoDataCollector"]
+__all__ = ["NetmikoConnectionPool", "NetmikoDataCollector", "CONNECTION_POOL", "harvest_many"]
 
 
-class NetmikoDataCollector:
-    """Collects device data over SSH using Netmiko."""
+_RE_MDA = re.compile(r"(?m)^\s*(\d+)\s+\d+\s+([^\s:]+)?")
+_RE_CARD_NAME = re.compile(r"(Card\s+[A-Fa-f1-9])")
+_RE_CARD_TYPE = re.compile(r"[1234ABCD]\s+(\S+)")
+# Applied one line at a time, so backtracking is bounded by the line length.
+_RE_CARD_PROVISIONED = re.compile(r"[\w. ]+ (\w+-\S*) *up")
+_RE_CARD_UNPROVISIONED = re.compile(r"[\d \w.]+.not provisioned")
+_RE_LEADING_TOKEN = re.compile(r"\W*(\S*)")
+_RE_PORTS_UP = re.compile(r"(?i)(\d/\d/.*/\d)\s{4,}(to[\s\-_].*)")
+_RE_LAG = re.compile(
+    r"(\d\S+)\s+(?:Up)\s+(?:Yes)\s+(?:Up|Link\s+Up)\s+\d+\s+\d+\s+(\d+)"
+)
+_RE_DIGIT_RUN = re.compile(r"(\d+)")
+
+
+def _natural_key(value: str) -> Tuple[Any, ...]:
+    """Sort key that orders ``1/1/2`` before ``1/1/10`` and ``LAG 2`` before ``LAG 10``."""
+    # re.split with a capture group alternates text and digit runs, so ints and
+    # strs always land in the same tuple positions and stay comparable.
+    return tuple(
+        int(part) if index % 2 else part
+        for index, part in enumerate(_RE_DIGIT_RUN.split(value))
+    )
+
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, int, str, str, str]
+
+
+def _env_number(name: str, cast, default):
+    """Read a numeric environment variable, falling back to ``default`` when unset or invalid."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %r", name, raw, default)
+        return default
+
+
+def _close_quietly(conn) -> None:
+    """Close a Netmiko session, ignoring errors from one that is already gone."""
+    try:
+        conn.disconnect()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+class NetmikoConnectionPool:
+    """Keeps idle Netmiko sessions around so repeat harvests skip the SSH handshake.
+
+    Sessions are keyed by ``(ip, port, username, device_type)`` plus a SHA-256
+    fingerprint of the credentials, so only a caller presenting the same
+    password gets a session back. A session is handed out to one caller at a
+    time: ``acquire`` removes it from the pool and ``release`` puts it back.
+    Idle sessions older than ``idle_timeout`` seconds, and sessions opened more
+    than ``max_age`` seconds ago, are evicted lazily on every acquire/release.
+    ``discard`` closes a session instead of pooling it, for callers that hit an
+    error mid-session.
+    """
+
+    def __init__(
+        self, idle_timeout: float = 300.0, max_size: int = 8, max_age: Optional[float] = None
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self.max_age = max_age
+        # key -> (session, last released, opened at)
+        self._idle: Dict[PoolKey, Tuple[Any, float, float]] = {}
+        # id(session) -> opened at, for sessions currently handed out
+        self._opened_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
 
-    device_type_alias = {
-        # Nokia - SR OS (SROS)
-        "NokiaSrosSSH": ["nokia_sros"],
+    @classmethod
+    def from_env(cls) -> Optional["NetmikoConnectionPool"]:
+        """Build a pool from ``CONNECTION_POOL_*`` variables, or ``None`` when disabled."""
+        enabled = os.environ.get("CONNECTION_POOL_ENABLED", "").strip().lower()
+        if enabled not in {"1", "true", "yes", "on"}:
+            return None
+        return cls(
+            idle_timeout=_env_number("CONNECTION_POOL_IDLE_TIMEOUT", float, 300.0),
+            max_size=_env_number("CONNECTION_POOL_MAX_SIZE", int, 8),
+            max_age=_env_number("CONNECTION_POOL_MAX_AGE", float, None),
+        )
 
-        # Fortinet - FortiOS
-        "FortinetSSH": ["fortinet"],
+    @staticmethod
+    def key_for(ssh_connect: Dict[str, Any]) -> PoolKey:
+        # The credential fingerprint keeps a session from being handed to a
+        # caller who knows the username but not the password (or enable
+        # secret / key file) it was opened with.
+        credentials = "\0".join(
+            str(ssh_connect.get(field) or "") for field in ("password", "secret", "key_file")
+        )
+        return (
+            str(ssh_connect.get("ip") or ssh_connect.get("host")),
+            int(ssh_connect.get("port") or 22),
+            str(ssh_connect.get("username")),
+            str(ssh_connect.get("device_type")),
+            hashlib.sha256(credentials.encode("utf-8")).hexdigest(),
+        )
 
-        # HPE / Aruba - Various OSes
-        "HpeComwareSSH": ["hp_comware"],
-        "HpeProcurveSSH": ["hp_procurve"],
-        "ArubaOsSSH": ["aruba_os"],
-        "ArubaCxSSH": ["aruba_os_cx"],
+    def acquire(self, ssh_connect: Dict[str, Any]):
+        """Return a live pooled session for ``ssh_connect`` or open a new one."""
+        key = self.key_for(ssh_connect)
+        with self._lock:
+            expired = self._evict_expired_locked(time.monotonic())
+            entry = self._idle.pop(key, None)
+        self._close_all(expired)
+
+        if entry is not None:
+            conn, _, opened_at = entry
+            if self._is_alive(conn):
+                with self._lock:
+                    self._opened_at[id(conn)] = opened_at
+                return conn
+            _close_quietly(conn)
+        conn = ConnectHandler(**ssh_connect)
+        with self._lock:
+            self._opened_at[id(conn)] = time.monotonic()
+        return conn
+
+    def release(self, ssh_connect: Dict[str, Any], conn) -> None:
+        """Return ``conn`` to the pool so the next acquire for the same key can reuse it."""
+        key = self.key_for(ssh_connect)
+        now = time.monotonic()
+        with self._lock:
+            opened_at = self._opened_at.pop(id(conn), now)
+            evicted = self._evict_expired_locked(now)
+            previous = self._idle.pop(key, None)
+            if previous is not None:
+                evicted.append(previous[0])
+            while self._idle and len(self._idle) >= self.max_size:
+                oldest = min(self._idle, key=lambda k: self._idle[k][1])
+                evicted.append(self._idle.pop(oldest)[0])
+            if self.max_size > 0 and not self._too_old(opened_at, now):
+                self._idle[key] = (conn, now, opened_at)
+            else:
+                evicted.append(conn)
+        self._close_all(evicted)
+
+    def discard(self, conn) -> None:
+        """Close ``conn`` without returning it to the pool."""
+        with self._lock:
+            self._opened_at.pop(id(conn), None)
+        _close_quietly(conn)
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = [entry[0] for entry in self._idle.values()]
+            self._idle.clear()
+        self._close_all(conns)
+
+    def _too_old(self, opened_at: float, now: float) -> bool:
+        return self.max_age is not None and now - opened_at > self.max_age
+
+    def _evict_expired_locked(self, now: float) -> List[Any]:
+        expired_keys = [
+            key
+            for key, (_, last_used, opened_at) in self._idle.items()
+            if now - last_used > self.idle_timeout or self._too_old(opened_at, now)
+        ]
+        return [self._idle.pop(key)[0] for key in expired_keys]
 
-        # Adtran - AOS
-        "AdtranOsSSH": ["adtran_os", "adtran_aos"],
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        try:
+            return bool(conn.is_alive())
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    @staticmethod
+    def _close_all(conns: List[Any]) -> None:
+        for conn in conns:
+            _close_quietly(conn)
+
+
+CONNECTION_POOL = NetmikoConnectionPool.from_env()
+if CONNECTION_POOL is not None:
+    atexit.register(CONNECTION_POOL.close_all)
 
-        # MikroTik - RouterOS / SwOS
-        "MikrotikRouterOsSSH": ["mikrotik_routeros"],
-        "MikrotikSwOsSSH": ["mikrotik_swos"],
 
-        # Ubiquiti - EdgeOS / UniFi
-        "UbiquitiEdgeSSH": ["ubiquiti_edge", "ubiquiti_edgeswitch", "ubiquiti_edgemax"],
-        "UbiquitiUnifiSSH": ["ubiquiti_unifi", "unifi_os"],
-    }
+class NetmikoDataCollector:
+    """Collects device data over SSH using Netmiko."""
+
+    device_type_alias = DEVICE_TYPE_ALIASES
+    DEVICE_OS_CHOICES = DEVICE_OS_CHOICES
 
     @classmethod
     def build_ssh_config(cls, ip: str, username: str, password: str, device_os: str) -> Dict[str, str]:
@@ -57,13 +227,19 @@ class NetmikoDataCollector:
             "password": password,
         }
 
-    def __init__(self, ssh_connect: Dict[str, str], rules: Optional[RulesEngine] = None) -> None:
+    def __init__(
+        self,
+        ssh_connect: Dict[str, str],
+        rules: Optional[RulesEngine] = None,
+        pool: Optional[NetmikoConnectionPool] = None,
+    ) -> None:
         self.ssh_connect = ssh_connect
         self.conn = None
         self.device_alias = self.ssh_connect["device_type"]
         self.host_name: Optional[str] = None
         self.device_type: Optional[str] = None
         self.rules = rules
+        self.pool = pool if pool is not None else CONNECTION_POOL
 
     def _ensure_connect(self) -> None:
         if not self.conn:
@@ -71,15 +247,29 @@ class NetmikoDataCollector:
 
     def connect_or_fail(self) -> None:
         try:
-            self.conn = ConnectHandler(**self.ssh_connect)
+            if self.pool is not None:
+                self.conn = self.pool.acquire(self.ssh_connect)
+            else:
+                self.conn = ConnectHandler(**self.ssh_connect)
         except (NetmikoTimeoutException, NetmikoAuthenticationException) as exc:
             raise ConnectionError(
                 f"[ERROR] Could not connect to device {self.ssh_connect['ip']}: {exc}"
             ) from exc
 
-    def disconnect(self) -> None:
+    def disconnect(self, discard: bool = False) -> None:
+        """Hand the session back to the pool, or close it. Never raises.
+
+        Pass ``discard=True`` after an error so a session in an unknown state is
+        closed rather than reused.
+        """
         if self.conn:
-            self.conn.disconnect()
+            if self.pool is not None:
+                if discard:
+                    self.pool.discard(self.conn)
+                else:
+                    self.pool.release(self.ssh_connect, self.conn)
+            else:
+                _close_quietly(self.conn)
             self.conn = None
             self.host_name = None
             self.device_type = None
@@ -98,22 +288,30 @@ class NetmikoDataCollector:
     def _harvest_nokia_sros(self) -> NormalizedInventory:
         assert self.conn is not None
 
-        chassis_detail = self.conn.send_command("show system information")
-        ports_raw = self.conn.send_command("show port description")
-        card_detail = self.conn.send_command("show card detail")
-        cli_output_mda = self.conn.send_command("show mda")
-        show_card = self.conn.send_command("show card")
-        find_lag = self.conn.send_command("show port")
+        (
+            chassis_detail,
+            ports_raw,
+            card_detail,
+            cli_output_mda,
+            show_card,
+            find_lag,
+        ) = self._send_commands(
+            "show system information",
+            "show port description",
+            "show card detail",
+            "show mda",
+            "show card",
+            "show port",
+        )
 
-        host_name = self._extract_first(r".*System Name.*: (.*)", chassis_detail)
-        device_type_raw = self._extract_first(r".*System Type.*: (.*)", chassis_detail)
+        host_name = self._extract_field("System Name", chassis_detail)
+        device_type_raw = self._extract_field("System Type", chassis_detail)
 
         self.host_name = host_name
         self.device_type = device_type_raw
 
-        serial_numbers = re.findall(
-            r"CLEI code\s+\S+\s+\S+\s+\S+\s+\S+\s+\S+\s+(\S+)",
-            card_detail,
+        serial_numbers, card_names, module_bay_matches, provisioned_type = self._parse_card_detail(
+            card_detail
         )
 
         device = NormalizedDevice(
@@ -125,7 +323,7 @@ class NetmikoDataCollector:
             serial=serial_numbers[0] if serial_numbers else None,
         )
 
-        mda_matches = re.findall(r"(?m)^\s*(\d+)\s+\d+\s+([^\s:]+)?", cli_output_mda)
+        mda_matches = _RE_MDA.findall(cli_output_mda)
         mda_bays: List[str] = []
         mda_modules: List[tuple[str, str]] = []
         for slot, descriptor in mda_matches:
@@ -134,44 +332,32 @@ class NetmikoDataCollector:
             module_model = descriptor or f"mda-slot-{slot}"
             mda_modules.append((bay_name, module_model))
 
-        card_names = re.findall(r"(Card\s+[A-Fa-f1-9])", card_detail)
-        card_types = re.findall(r"[1234ABCD]\s+(\S+)", show_card)
+        card_types = _RE_CARD_TYPE.findall(show_card)
         card_modules = list(zip(card_names, card_types))
 
-        module_bay_matches = re.findall(r"(Card\s+[A-Fa-f1-4])", card_detail)
-        card_pattern = re.compile(
-            r"(^[\d \w.]+ (\w+-\d*\S*) *up|^[\d \w.]+.not provisioned.*\n\W*(\S*))",
-            re.MULTILINE,
-        )
-        provisioned_type: List[str] = []
-        for match in card_pattern.finditer(card_detail):
-            provisioned_type.append(match.group(3) if match.group(3) else match.group(2))
         module_pairs = list(zip(module_bay_matches, provisioned_type))
 
-        ports_up = re.findall(r"(?i)(\d/\d/.*/\d)\s{4,}(to[\s\-_].*)", ports_raw)
-        regex_lag = re.findall(
-            r"(\d\S+)\s+(?:Up)\s+(?:Yes)\s+(?:Up|Link\s+Up)\s+\d+\s+\d+\s+(\d+)",
-            find_lag,
-        )
+        ports_up = _RE_PORTS_UP.findall(ports_raw)
+        regex_lag = _RE_LAG.findall(find_lag)
 
-        module_bay_names = set()
-        module_bay_names.update(name for name, _ in module_pairs)
-        module_bay_names.update(name for name, _ in card_modules)
-        module_bay_names.update(mda_bays)
+        module_bay_names = (
+            {name for name, _ in module_pairs} | {name for name, _ in card_modules} | set(mda_bays)
+        )
 
         module_bays = [
             NormalizedModuleBay(name=name, label=name, position=self._bay_position(name))
-            for name in sorted(module_bay_names)
+            for name in sorted(module_bay_names, key=_natural_key)
         ]
 
-        module_entries: Dict[tuple[str, str], NormalizedModule] = {}
+        # A bay holds a single module, so the first source to report a model
+        # for a bay wins: provisioned card type, then show card, then MDA.
+        module_entries: Dict[str, NormalizedModule] = {}
 
         def add_module(bay_name: str, model: Optional[str]) -> None:
             if not bay_name or not model:
                 return
-            key = (bay_name, model)
-            if key not in module_entries:
-                module_entries[key] = NormalizedModule(bay_name=bay_name, module_type_model=model)
+            if bay_name not in module_entries:
+                module_entries[bay_name] = NormalizedModule(bay_name=bay_name, module_type_model=model)
 
         for bay_name, model in module_pairs:
             add_module(bay_name, model)
@@ -186,13 +372,19 @@ class NetmikoDataCollector:
             port: desc.strip() if desc and desc.strip() else None for port, desc in ports_up
         }
 
-        lag_members: Dict[str, Set[str]] = {}
+        # Members keep the order the device lists them in; the side set only
+        # guards against a port being reported twice.
+        lag_members: Dict[str, List[str]] = {}
+        seen_members: Set[Tuple[str, str]] = set()
         for port, lag_id in regex_lag:
             lag_name = f"LAG {lag_id}"
-            lag_members.setdefault(lag_name, set()).add(port)
+            if (lag_name, port) not in seen_members:
+                seen_members.add((lag_name, port))
+                lag_members.setdefault(lag_name, []).append(port)
 
         interfaces: List[NormalizedInterface] = []
-        for lag_name in sorted(lag_members.keys()):
+        lag_names = sorted(lag_members, key=_natural_key)
+        for lag_name in lag_names:
             interfaces.append(
                 NormalizedInterface(
                     name=lag_name,
@@ -202,12 +394,14 @@ class NetmikoDataCollector:
                 )
             )
 
-        ports_seen = set(desc_map.keys())
-        for members in lag_members.values():
-            ports_seen.update(members)
+        ports_seen = {*desc_map, *chain.from_iterable(lag_members.values())}
 
-        for port_name in sorted(ports_seen):
-            lag_name = self._find_lag_for_port(port_name, lag_members)
+        port_to_lag = {
+            port: lag_name for lag_name, members in lag_members.items() for port in members
+        }
+
+        for port_name in sorted(ports_seen, key=_natural_key):
+            lag_name = port_to_lag.get(port_name)
             interfaces.append(
                 NormalizedInterface(
                     name=port_name,
@@ -217,12 +411,14 @@ class NetmikoDataCollector:
                     lag=lag_name,
                 )
             )
-            if lag_name:
-                lag_members[lag_name].add(port_name)
 
         lags = [
-            NormalizedLag(name=lag_name, description=None, members=sorted(members))
-            for lag_name, members in sorted(lag_members.items())
+            NormalizedLag(
+                name=lag_name,
+                description=None,
+                members=lag_members[lag_name],
+            )
+            for lag_name in lag_names
         ]
 
         return NormalizedInventory(
@@ -233,22 +429,125 @@ class NetmikoDataCollector:
             lags=lags,
         )
 
+    def _send_commands(self, *commands: str) -> List[str]:
+        """Run ``commands`` back to back, detecting the device prompt only once.
+
+        Without an ``expect_string`` Netmiko calls ``find_prompt()`` before every
+        command, which costs an extra round trip per command.
+        """
+        assert self.conn is not None
+        expect_string = re.escape(self.conn.find_prompt())
+        return [self.conn.send_command(command, expect_string=expect_string) for command in commands]
+
     @staticmethod
-    def _find_lag_for_port(port_name: str, lag_members: Dict[str, Set[str]]) -> Optional[str]:
-        for lag_name, members in lag_members.items():
-            if port_name in members:
-                return lag_name
-        return None
+    def _parse_card_detail(
+        card_detail: str,
+    ) -> Tuple[List[str], List[str], List[str], List[Optional[str]]]:
+        """Extract serials, card names, module bays and card types in one pass.
+
+        Serial numbers are the sixth whitespace-separated token after
+        ``CLEI code`` and the type of an unprovisioned card is the first token
+        on the following non-blank line, so both may continue across lines.
+        """
+        serial_numbers: List[str] = []
+        card_names: List[str] = []
+        module_bays: List[str] = []
+        provisioned_type: List[Optional[str]] = []
+
+        clei_tokens: Optional[List[str]] = None
+        awaiting_type = False
+
+        lines = card_detail.split("\n")
+        last_index = len(lines) - 1
+        for index, line in enumerate(lines):
+            if clei_tokens is not None:
+                clei_tokens.extend(line.split())
+            elif "CLEI code" in line:
+                tail = line.partition("CLEI code")[2]
+                if not tail or tail[0].isspace():
+                    clei_tokens = tail.split()
+            if clei_tokens is not None and len(clei_tokens) >= 6:
+                serial_numbers.append(clei_tokens[5])
+                clei_tokens = None
+
+            if "Card" in line:
+                for name in _RE_CARD_NAME.findall(line):
+                    card_names.append(name)
+                    if name[-1] in "ABCDEFabcdef1234":
+                        module_bays.append(name)
+
+            if awaiting_type:
+                token = _RE_LEADING_TOKEN.match(line).group(1)
+                if token:
+                    provisioned_type.append(token)
+                    awaiting_type = False
+                continue
+
+            if "-" in line and "up" in line:
+                match = _RE_CARD_PROVISIONED.match(line)
+                if match:
+                    provisioned_type.append(match.group(1))
+                    continue
+            if (
+                index < last_index
+                and "not provisioned" in line
+                and _RE_CARD_UNPROVISIONED.match(line)
+            ):
+                awaiting_type = True
+
+        if awaiting_type:
+            provisioned_type.append(None)
+
+        return serial_numbers, card_names, module_bays, provisioned_type
 
     @staticmethod
-    def _extract_first(pattern: str, text: str) -> str:
-        match = re.search(pattern, text, re.MULTILINE)
-        if not match:
-            raise ValueError(f"Pattern '{pattern}' not found in device output")
-        return match.group(1).strip()
+    def _extract_field(label: str, text: str) -> str:
+        """Return the value after the last ``": "`` on the first line mentioning ``label``."""
+        for line in text.split("\n"):
+            if label not in line:
+                continue
+            head, separator, value = line.rpartition(": ")
+            if separator and label in head:
+                return value.strip()
+        raise ValueError(f"Field '{label}' not found in device output")
 
     @staticmethod
     def _bay_position(name: str) -> Optional[str]:
         if not name:
             return None
         return name.split()[-1]
+
+
+HarvestResult = Tuple[Dict[str, str], Optional[NormalizedInventory], Optional[Exception]]
+
+
+def harvest_many(
+    ssh_configs: Iterable[Dict[str, str]],
+    rules: RulesEngine,
+    max_workers: int = 4,
+    pool: Optional[NetmikoConnectionPool] = None,
+) -> List[HarvestResult]:
+    """Harvest several devices concurrently on a bounded thread pool.
+
+    Netmiko sessions block while waiting on the device, so running them on
+    threads overlaps that wait. Each result is ``(ssh_config, inventory, error)``
+    and results keep the order of ``ssh_configs``.
+    """
+
+    def harvest_one(ssh_config: Dict[str, str]) -> HarvestResult:
+        collector = NetmikoDataCollector(ssh_config, rules=rules, pool=pool)
+        inventory = None
+        try:
+            collector.connect_or_fail()
+            inventory = collector.harvest()
+            return ssh_config, inventory, None
+        except Exception as exc:  # pylint: disable=broad-except
+            return ssh_config, None, exc
+        finally:
+            collector.disconnect(discard=inventory is None)
+
+    configs = list(ssh_configs)
+    if max_workers <= 1 or len(configs) <= 1:
+        return [harvest_one(ssh_config) for ssh_config in configs]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(configs))) as executor:
+        return list(executor.map(harvest_one, configs))
@@ -0,0 +1,143 @@
+"""Offline stand-ins used by ``connector_cli --simulate``; imported lazily."""
+
+from __future__ import annotations
+
+import itertools
+from types import SimpleNamespace
+from typing import List
+
+from .config_loader import AppConfig
+from .models import (
+    NormalizedDevice,
+    NormalizedInterface,
+    NormalizedInventory,
+    NormalizedLag,
+    NormalizedModule,
+    NormalizedModuleBay,
+)
+
+
+__all__ = ["_build_fake_netbox_api", "_build_sample_inventory"]
+
+
+class _FakeEndpoint:
+    def __init__(self) -> None:
+        self._records: List[_FakeRecord] = []
+
+    def get(self, **kwargs):
+        return None
+
+    def filter(self, **kwargs):
+        return []
+
+    def create(self, payload):
+        if isinstance(payload, list):
+            return [self.create(item) for item in payload]
+        record = _FakeRecord(payload)
+        self._records.append(record)
+        return record
+
+    def update(self, objects):
+        # Bulk PATCH: each dict carries the record id plus the fields to change.
+        by_id = {record.id: record for record in self._records}
+        updated = []
+        for changes in objects:
+            changes = dict(changes)
+            updated.append(by_id[changes.pop("id")].update(changes))
+        return updated
+
+
+class _FakeRecord:
+    _id_gen = itertools.count(1)
+
+    def __init__(self, data: dict) -> None:
+        self._data = data
+        self.id = next(_FakeRecord._id_gen)
+
+    def __getattr__(self, name):
+        # Mirror pynetbox records, which expose fields as attributes.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._data.get(name)
+
+    def serialize(self):
+        return self._data
+
+    def update(self, payload):
+        self._data.update(payload)
+        return self
+
+
+def _build_fake_netbox_api():
+    endpoints = SimpleNamespace(
+        devices=_FakeEndpoint(),
+        module_bays=_FakeEndpoint(),
+        modules=_FakeEndpoint(),
+        interfaces=_FakeEndpoint(),
+        manufacturers=_FakeEndpoint(),
+        device_types=_FakeEndpoint(),
+        module_types=_FakeEndpoint(),
+        sites=_FakeEndpoint(),
+        device_roles=_FakeEndpoint(),
+    )
+    api = SimpleNamespace(dcim=endpoints)
+    api.http_session = SimpleNamespace(verify=True)
+    return api
+
+
+def _build_sample_inventory(config: AppConfig) -> NormalizedInventory:
+    host_name = "SIM-SROS-01"
+    device_type_raw = "Nokia 7750 SR-7"
+    device = NormalizedDevice(
+        name=host_name,
+        site_slug=config.rules.site_slug(host_name),
+        role_slug=config.rules.role_slug(host_name),
+        manufacturer_slug=config.rules.manufacturer_slug(host_name),
+        device_type_slug=config.rules.device_type_slug(device_type_raw),
+        status="active",
+    )
+
+    module_bays = [
+        NormalizedModuleBay(name="Card A", label="Card A", position="A"),
+        NormalizedModuleBay(name="Card B", label="Card B", position="B"),
+    ]
+
+    modules = [
+        NormalizedModule(bay_name="Card A", module_type_model="mda-imm-24"),
+        NormalizedModule(bay_name="Card B", module_type_model="mda-xc-12"),
+    ]
+
+    lag_name = "LAG 1"
+    interfaces = [
+        NormalizedInterface(
+            name=lag_name,
+            type_slug=config.rules.interface_type(lag_name, is_lag=True),
+            enabled=True,
+            description="Simulated uplink",
+        ),
+        NormalizedInterface(
+            name="1/1/1",
+            type_slug=config.rules.interface_type("1/1/1"),
+            enabled=True,
+            description="Simulated member",
+            lag=lag_name,
+        ),
+        NormalizedInterface(
+            name="1/1/2",
+            type_slug=config.rules.interface_type("1/1/2"),
+            enabled=True,
+            description="Access port",
+        ),
+    ]
+
+    lags = [
+        NormalizedLag(name=lag_name, members=["1/1/1"], description="Simulated bundle"),
+    ]
+
+    return NormalizedInventory(
+        device=device,
+        module_bays=module_bays,
+        modules=modules,
+        interfaces=interfaces,
+        lags=lags,
+    )
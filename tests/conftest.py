@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the src/ layout importable for every test module without installing it.
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _netbox_token_env():
+    # load_app_config() requires a token; keep a real one if it is already set.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("NETBOX_TOKEN", os.environ.get("NETBOX_TOKEN") or "dummy-token")
+        yield
@@ -0,0 +1,233 @@
+import re
+
+import pytest
+
+import netbox_connector.netmiko_ssh_handler as handler
+from netbox_connector.config_loader import load_app_config
+from netbox_connector.netmiko_ssh_handler import NetmikoDataCollector
+
+
+SYSTEM_INFORMATION = """\
+===============================================================================
+System Information
+===============================================================================
+System Name            : PAR-SAS-S-01
+System Type            : 7750 SR-7
+System Version         : B-20.10.R1
+"""
+
+PORT_DESCRIPTION = """\
+===============================================================================
+Port Descriptions on Slot 1
+===============================================================================
+Port Id          Description
+-------------------------------------------------------------------------------
+1/1/1            to-core-01 uplink
+1/2/c1/1         to-breakout
+"""
+
+CARD_DETAIL = """\
+===============================================================================
+Card 1
+===============================================================================
+Slot      Provisioned Type                         Admin Operational   Comments
+-------------------------------------------------------------------------------
+1         iom4-e                                   up    up
+
+Hardware Data
+    Part number                       : 3HE10493AARA01
+    CLEI code                         : IPUCBJ5AAA
+    Serial number                     : NS1634F0123
+===============================================================================
+Card 2
+===============================================================================
+2         (not provisioned)
+              iom4-e-b
+"""
+
+SHOW_MDA = """\
+===============================================================================
+MDA Summary
+===============================================================================
+Slot  Mda   Provisioned Type                            Admin     Operational
+-------------------------------------------------------------------------------
+1     1     me10-10gb-sfp+                              up        up
+"""
+
+SHOW_CARD = """\
+===============================================================================
+Card Summary
+===============================================================================
+1         iom4-e                                   up    up
+2         iom4-e-b                                 up    up
+"""
+
+SHOW_PORT = """\
+===============================================================================
+Ports on Slot 1
+===============================================================================
+1/1/1         Up    Yes  Up      9212 9212    1 accs qinq xcme   10GBASE-LR
+1/1/10        Up    Yes  Link Up 9212 9212    1 accs qinq xcme   10GBASE-LR
+1/1/3         Down  No   Down    9212 9212    - accs qinq xcme
+"""
+
+
+class _FakeConnection:
+    outputs = {
+        "show system information": SYSTEM_INFORMATION,
+        "show port description": PORT_DESCRIPTION,
+        "show card detail": CARD_DETAIL,
+        "show mda": SHOW_MDA,
+        "show card": SHOW_CARD,
+        "show port": SHOW_PORT,
+    }
+
+    def find_prompt(self):
+        return "A:PAR-SAS-S-01#"
+
+    def send_command(self, command, **kwargs):
+        assert kwargs.get("expect_string") == re.escape(self.find_prompt())
+        return self.outputs[command]
+
+    def disconnect(self):
+        pass
+
+
+class _PooledConnection(_FakeConnection):
+    def __init__(self, opened):
+        self.closed = False
+        opened.append(self)
+
+    def is_alive(self):
+        return not self.closed
+
+    def disconnect(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened_sessions(monkeypatch):
+    """Patch ConnectHandler to open _PooledConnection fakes and return them in order."""
+    opened = []
+    monkeypatch.setattr(handler, "ConnectHandler", lambda **kwargs: _PooledConnection(opened))
+    return opened
+
+
+def _collector():
+    config = load_app_config()
+    ssh_config = NetmikoDataCollector.build_ssh_config("192.0.2.10", "admin", "secret", "nokia_sros")
+    collector = NetmikoDataCollector(ssh_config, rules=config.rules)
+    collector.conn = _FakeConnection()
+    return collector
+
+
+def test_parse_card_detail_single_pass():
+    serials, card_names, module_bays, provisioned = NetmikoDataCollector._parse_card_detail(
+        CARD_DETAIL
+    )
+
+    assert serials == ["NS1634F0123"]
+    assert card_names == ["Card 1", "Card 2"]
+    assert module_bays == ["Card 1", "Card 2"]
+    assert provisioned == ["iom4-e", "iom4-e-b"]
+
+
+def test_harvest_nokia_sros_builds_inventory():
+    inventory = _collector().harvest()
+
+    assert inventory.device.name == "PAR-SAS-S-01"
+    assert inventory.device.site_slug == "par"
+    assert inventory.device.device_type_slug == "nokia-7750-sr"
+    assert inventory.device.serial == "NS1634F0123"
+
+    assert [bay.name for bay in inventory.module_bays] == ["Card 1", "Card 2", "MDA 1"]
+    modules = {(m.bay_name, m.module_type_model) for m in inventory.modules}
+    assert ("Card 1", "iom4-e") in modules
+    assert ("Card 2", "iom4-e-b") in modules
+    assert ("MDA 1", "me10-10gb-sfp+") in modules
+
+    lags = {lag.name: lag.members for lag in inventory.lags}
+    assert lags == {"LAG 1": ["1/1/1", "1/1/10"]}
+
+    interfaces = {iface.name: iface for iface in inventory.interfaces}
+    assert interfaces["LAG 1"].type_slug == "lag"
+    assert interfaces["1/1/10"].lag == "LAG 1"
+    assert interfaces["1/2/c1/1"].description == "to-breakout"
+
+
+def test_connection_pool_reuses_released_session(opened_sessions):
+    pool = handler.NetmikoConnectionPool(idle_timeout=60, max_size=2)
+    ssh_config = NetmikoDataCollector.build_ssh_config("192.0.2.10", "admin", "secret", "nokia_sros")
+
+    first = NetmikoDataCollector(ssh_config, pool=pool)
+    first.connect_or_fail()
+    first.disconnect()
+
+    second = NetmikoDataCollector(ssh_config, pool=pool)
+    second.connect_or_fail()
+
+    assert len(opened_sessions) == 1
+    assert second.conn is opened_sessions[0]
+    assert not opened_sessions[0].closed
+
+    second.disconnect()
+    pool.close_all()
+    assert opened_sessions[0].closed
+
+
+def test_connection_pool_drops_old_and_discarded_sessions(monkeypatch, opened_sessions):
+    clock = [0.0]
+    monkeypatch.setattr(handler.time, "monotonic", lambda: clock[0])
+    pool = handler.NetmikoConnectionPool(idle_timeout=60, max_size=2, max_age=10)
+    ssh_config = NetmikoDataCollector.build_ssh_config("192.0.2.10", "admin", "secret", "nokia_sros")
+
+    collector = NetmikoDataCollector(ssh_config, pool=pool)
+    collector.connect_or_fail()
+    clock[0] = 5.0
+    collector.disconnect()
+    assert not opened_sessions[0].closed
+
+    clock[0] = 11.0
+    collector.connect_or_fail()
+    assert opened_sessions[0].closed
+    assert collector.conn is opened_sessions[1]
+
+    collector.disconnect(discard=True)
+    assert opened_sessions[1].closed
+    collector.connect_or_fail()
+    assert len(opened_sessions) == 3
+    pool.close_all()
+
+
+def test_connection_pool_keys_sessions_by_credentials(opened_sessions):
+    pool = handler.NetmikoConnectionPool(idle_timeout=60, max_size=2)
+    owner = NetmikoDataCollector.build_ssh_config("192.0.2.10", "admin", "secret", "nokia_sros")
+    other = NetmikoDataCollector.build_ssh_config("192.0.2.10", "admin", "guess", "nokia_sros")
+
+    first = NetmikoDataCollector(owner, pool=pool)
+    first.connect_or_fail()
+    first.disconnect()
+
+    second = NetmikoDataCollector(other, pool=pool)
+    second.connect_or_fail()
+
+    assert len(opened_sessions) == 2
+    assert second.conn is opened_sessions[1]
+    assert not opened_sessions[0].closed
+
+    second.disconnect()
+    pool.close_all()
+
+
+def test_connection_pool_from_env_ignores_invalid_numbers(monkeypatch, caplog):
+    monkeypatch.setenv("CONNECTION_POOL_ENABLED", "1")
+    monkeypatch.setenv("CONNECTION_POOL_MAX_SIZE", "eight")
+    monkeypatch.setenv("CONNECTION_POOL_IDLE_TIMEOUT", "soon")
+    monkeypatch.setenv("CONNECTION_POOL_MAX_AGE", "30")
+
+    pool = handler.NetmikoConnectionPool.from_env()
+
+    assert pool.max_size == 8
+    assert pool.idle_timeout == 300.0
+    assert pool.max_age == 30.0
+    assert "CONNECTION_POOL_MAX_SIZE" in caplog.text
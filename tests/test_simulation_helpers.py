@@ -1,36 +1,10 @@
 import os
-import sys
-from pathlib import Path
-
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-SRC_DIR = PROJECT_ROOT / "src"
-if str(SRC_DIR) not in sys.path:
-    sys.path.insert(0, str(SRC_DIR))
-
-try:
-    from netbox_connector.connector_cli import (  # type: ignore[import-not-found]
-        _build_fake_netbox_api,
-        _build_sample_inventory,
-    )
-    from netbox_connector.config_loader import load_app_config  # type: ignore[import-not-found]
-    from netbox_connector.netbox_devices_full import NetboxDeviceBuilder  # type: ignore[import-not-found]
-except ModuleNotFoundError:  # pragma: no cover - fallback for legacy layout
-    from connector_cli import _build_fake_netbox_api, _build_sample_inventory
-    from config_loader import load_app_config
-    from netbox_devices_full import NetboxDeviceBuilder
-
-
-def _with_token_env():
-    original = os.environ.get("NETBOX_TOKEN")
-    os.environ["NETBOX_TOKEN"] = original or "dummy-token"
-    return original
+from dataclasses import replace
 
-
-def _restore_token_env(original):
-    if original is None:
-        os.environ.pop("NETBOX_TOKEN", None)
-    else:
-        os.environ["NETBOX_TOKEN"] = original
+from netbox_connector.config_loader import load_app_config
+from netbox_connector.models import NormalizedInterface, NormalizedLag
+from netbox_connector.netbox_devices_full import NetboxDeviceBuilder
+from netbox_connector.simulate import _build_fake_netbox_api, _build_sample_inventory
 
 
 def test_fake_netbox_api_supports_basic_lifecycle():
@@ -52,11 +26,7 @@ def test_fake_netbox_api_supports_basic_lifecycle():
 
 
 def test_build_sample_inventory_respects_rules():
-    original_token = _with_token_env()
-    try:
-        config = load_app_config()
-    finally:
-        _restore_token_env(original_token)
+    config = load_app_config()
 
     inventory = _build_sample_inventory(config)
 
@@ -66,47 +36,39 @@ def test_build_sample_inventory_respects_rules():
     assert inventory.device.manufacturer_slug == "nokia"
     assert inventory.device.device_type_slug == "nokia-7750-sr"
 
-    lag_names = {lag.name for lag in inventory.lags}
-    assert "LAG 1" in lag_names
+    lag = next((lag for lag in inventory.lags if lag.name == "LAG 1"), None)
+    assert lag is not None
+    assert set(lag.members) == {"1/1/1"}
 
     interface_types = {iface.name: iface.type_slug for iface in inventory.interfaces}
     assert interface_types["LAG 1"] == "lag"
     assert interface_types["1/1/2"] == "other"
 
-    lag_member_lookup = {lag.name: set(lag.members) for lag in inventory.lags}
-    assert lag_member_lookup["LAG 1"] == {"1/1/1"}
-
 
-def test_load_app_config_allows_missing_token_when_flagged():
-    original = os.environ.pop("NETBOX_TOKEN", None)
-    try:
-        config = load_app_config(allow_missing_token=True)
-    finally:
-        if original is None:
-            os.environ.pop("NETBOX_TOKEN", None)
-        else:
-            os.environ["NETBOX_TOKEN"] = original
+def test_load_app_config_allows_missing_token_when_flagged(monkeypatch):
+    monkeypatch.delenv("NETBOX_TOKEN", raising=False)
+    config = load_app_config(allow_missing_token=True)
 
     assert config.netbox.token == "SIMULATED-TOKEN"
 
 
 def test_device_type_slug_falls_back_to_slugify():
-    original = _with_token_env()
-    try:
-        config = load_app_config()
-    finally:
-        _restore_token_env(original)
+    config = load_app_config()
 
     fallback_value = config.rules.device_type_slug("Unknown Model 5000")
     assert fallback_value == "unknown-model-5000"
 
 
+def test_interface_type_prefers_first_listed_matcher():
+    rules = load_app_config().rules
+
+    assert rules.interface_type("1/1/lag-uplink") == "lag"
+    assert rules.interface_type("1/1/1") == "other"
+    assert rules.interface_type("LAG 10", is_lag=True) == "lag"
+
+
 def test_dry_run_includes_preflight_report(tmp_path):
-    original = _with_token_env()
-    try:
-        config = load_app_config()
-    finally:
-        _restore_token_env(original)
+    config = load_app_config()
 
     config.netbox.proposals_dir = tmp_path
     builder = NetboxDeviceBuilder(config=config, nb_api=_build_fake_netbox_api())
@@ -119,3 +81,144 @@ def test_dry_run_includes_preflight_report(tmp_path):
     assert "Preflight issues detected:" in summary
     assert "Manufacturer slug 'nokia'" in summary
     assert "Module types not found" in summary
+
+
+def test_load_app_config_is_memoized_until_files_change(tmp_path):
+    settings_path = tmp_path / "settings.yaml"
+    rules_path = tmp_path / "rules.yaml"
+    settings_path.write_text(
+        f"netbox:\n  token: file-token\n  proposals_dir: {tmp_path / 'proposals'}\n",
+        encoding="utf-8",
+    )
+    rules_path.write_text("defaults:\n  role_slug: access-switch\n", encoding="utf-8")
+
+    first = load_app_config(settings_path=settings_path, rules_path=rules_path)
+    first.netbox.proposals_dir = tmp_path / "elsewhere"
+    second = load_app_config(settings_path=settings_path, rules_path=rules_path)
+
+    assert second.rules is first.rules
+    assert second.netbox.proposals_dir == tmp_path / "proposals"
+
+    rules_path.write_text("defaults:\n  role_slug: core-router\n", encoding="utf-8")
+    os.utime(rules_path, ns=(0, 0))
+    third = load_app_config(settings_path=settings_path, rules_path=rules_path)
+
+    assert third.rules is not first.rules
+    assert third.rules.role_slug("no-match") == "core-router"
+
+
+def _stub_reference_lookups(monkeypatch, api, device):
+    # The fake endpoints never find anything, so answer the builder's slug gets.
+    for endpoint_name, slug in (
+        ("sites", device.site_slug),
+        ("device_roles", device.role_slug),
+        ("device_types", device.device_type_slug),
+        ("manufacturers", device.manufacturer_slug),
+    ):
+        endpoint = getattr(api.dcim, endpoint_name)
+        record = endpoint.create({"slug": slug})
+        monkeypatch.setattr(endpoint, "get", lambda record=record, **kwargs: record)
+
+
+def test_apply_moves_lag_members_in_one_bulk_patch(monkeypatch, tmp_path):
+    config = load_app_config()
+    config.netbox.proposals_dir = tmp_path
+    api = _build_fake_netbox_api()
+    inventory = _build_sample_inventory(config)
+    _stub_reference_lookups(monkeypatch, api, inventory.device)
+
+    # NetBox today: 1/1/1 and 1/1/2 are in LAG 1, 1/1/3 is in no LAG.
+    device = api.dcim.devices.create({"name": inventory.device.name})
+    lag_1 = api.dcim.interfaces.create({"name": "LAG 1", "type": "lag", "enabled": True})
+    lag_2 = api.dcim.interfaces.create({"name": "LAG 2", "type": "lag", "enabled": True})
+    existing = [
+        lag_1,
+        lag_2,
+        api.dcim.interfaces.create({"name": "1/1/1", "type": "other", "enabled": True, "lag": lag_1}),
+        api.dcim.interfaces.create({"name": "1/1/2", "type": "other", "enabled": True, "lag": lag_1}),
+        api.dcim.interfaces.create({"name": "1/1/3", "type": "other", "enabled": True}),
+    ]
+    monkeypatch.setattr(api.dcim.devices, "get", lambda **kwargs: device)
+    monkeypatch.setattr(api.dcim.interfaces, "filter", lambda **kwargs: list(existing))
+
+    patches = []
+    bulk_update = api.dcim.interfaces.update
+    monkeypatch.setattr(
+        api.dcim.interfaces, "update", lambda objects: patches.append(objects) or bulk_update(objects)
+    )
+
+    # Desired: 1/1/1 moves to LAG 2, 1/1/2 leaves LAG 1, 1/1/3 joins LAG 1.
+    # LAG 2 comes first so LAG 1's removal of 1/1/1 must not undo the move.
+    inventory = replace(
+        inventory,
+        module_bays=[],
+        modules=[],
+        interfaces=[
+            NormalizedInterface(name=record.name, type_slug=record.type) for record in existing
+        ],
+        lags=[
+            NormalizedLag(name="LAG 2", members=["1/1/1"]),
+            NormalizedLag(name="LAG 1", members=["1/1/3"]),
+        ],
+    )
+    builder = NetboxDeviceBuilder(config=config, nb_api=api)
+    builder.apply(inventory, verify=False)
+
+    assert len(patches) == 1
+    assert sorted((change["id"], change["lag"]) for change in patches[0]) == [
+        (existing[2].id, lag_2.id),
+        (existing[3].id, None),
+        (existing[4].id, lag_1.id),
+    ]
+    assert existing[2].lag == lag_2.id
+    assert existing[3].lag is None
+    assert existing[4].lag == lag_1.id
+
+
+def test_apply_creates_lags_before_their_members(monkeypatch, tmp_path):
+    config = load_app_config()
+    config.netbox.proposals_dir = tmp_path
+    api = _build_fake_netbox_api()
+    # Module types cannot be resolved against the fake, so leave modules out.
+    inventory = replace(_build_sample_inventory(config), modules=[])
+    _stub_reference_lookups(monkeypatch, api, inventory.device)
+
+    posts = []
+    create = api.dcim.interfaces.create
+
+    def record_bulk_post(payload):
+        created = create(payload)
+        if isinstance(payload, list):  # the fake creates list items one by one
+            posts.append((payload, created))
+        return created
+
+    monkeypatch.setattr(api.dcim.interfaces, "create", record_bulk_post)
+
+    builder = NetboxDeviceBuilder(config=config, nb_api=api)
+    builder.apply(inventory, verify=False)
+
+    assert [[item["name"] for item in payload] for payload, _ in posts] == [
+        ["LAG 1"],
+        ["1/1/1", "1/1/2"],
+    ]
+    (lag_record,) = posts[0][1]
+    members = {item["name"]: item for item in posts[1][0]}
+    assert members["1/1/1"]["lag"] == lag_record.id
+    assert "lag" not in members["1/1/2"]
+
+
+def test_load_app_config_cache_is_bounded(tmp_path, monkeypatch):
+    import netbox_connector.config_loader as config_loader
+
+    settings_path = tmp_path / "settings.yaml"
+    rules_path = tmp_path / "rules.yaml"
+    settings_path.write_text("netbox:\n  token_env: ROTATING_TOKEN\n", encoding="utf-8")
+    rules_path.write_text("defaults:\n  role_slug: access-switch\n", encoding="utf-8")
+
+    config_loader.clear_config_cache()
+    for index in range(config_loader._APP_CONFIG_CACHE_SIZE + 5):
+        monkeypatch.setenv("ROTATING_TOKEN", f"token-{index}")
+        load_app_config(settings_path=settings_path, rules_path=rules_path)
+
+    assert len(config_loader._APP_CONFIG_CACHE) == config_loader._APP_CONFIG_CACHE_SIZE
+    config_loader.clear_config_cache()